@@ -0,0 +1 @@
+"""Rules engine and tree tools for the Celtic tile game."""
@@ -0,0 +1,181 @@
+"""Command line entry point: python -m celtic <command>.
+
+Each command imports only what it needs, so the headless commands never
+load matplotlib, PIL or NumPy.
+"""
+import argparse
+import json
+import sys
+
+from celtic import engine
+
+# render --style tree draws the whole 3x3 tree; larger boards stop at this depth
+RENDER_DEPTH = 3
+
+
+def _write(result, output):
+    text = json.dumps(result, indent=2)
+    if output is None:
+        print(text)
+    else:
+        with open(output, 'w') as handle:
+            handle.write(text + '\n')
+
+
+def _enumerate(args):
+    if args.workers == 1:
+        from celtic.tree import enumerate_tree
+
+        summary = enumerate_tree(size=args.size, max_depth=args.depth, max_nodes=args.max_nodes,
+                                 stats=args.stats)
+    else:
+        from celtic.parallel import parallel_enumerate
+
+        summary = parallel_enumerate(size=args.size, split_depth=args.split_depth,
+                                     workers=args.workers, max_depth=args.depth, stats=args.stats)
+    _write(summary.as_dict(), args.output)
+
+
+def _solve(args):
+    from celtic.solver import Solver
+
+    database = None
+    if args.database is not None:
+        from celtic.positiondb import PositionDatabase
+
+        database = PositionDatabase(args.database)
+    solver = Solver(max_nodes=args.max_nodes, time_limit=args.time_limit, database=database,
+                    stats=args.stats)
+    result = solver.solve(engine.Board.initial(args.size), max_depth=args.depth)
+    if database is not None:
+        database.close()
+    _write(dict(result._asdict(), size=args.size), args.output)
+
+
+def _simulate(args):
+    from celtic.simulate import DEFAULT_BATCH_SIZE, simulate
+
+    recorder = None
+    if args.record is not None:
+        from celtic.records import RecordWriter
+
+        recorder = RecordWriter(args.record, args.size, append=args.append)
+    batch_size = args.batch_size or DEFAULT_BATCH_SIZE
+    if args.stats is None:
+        summary = simulate(args.games, args.size, args.seed, batch_size, recorder)
+    else:
+        with args.stats.phase('simulate'):
+            summary = simulate(args.games, args.size, args.seed, batch_size, recorder)
+        args.stats.add('games', summary.games)
+        args.stats.add('moves', summary.moves)
+    if recorder is not None:
+        recorder.close()
+    _write(summary.as_dict(), args.output)
+
+
+def _render(args):
+    from celtic.game import CelticGame
+    from celtic import visualize
+
+    game = CelticGame(args.size)
+    if args.style == 'responses':
+        visualize.visualize_game_tree_with_responses(game, output_path=args.output,
+                                                     stats=args.stats)
+    else:
+        from celtic.transposition import TranspositionTable
+
+        depth = args.depth
+        if depth is None and args.size > engine.DEFAULT_SIZE:
+            depth = RENDER_DEPTH
+        visualize.visualize_complete_game_tree(
+            game, args.output or 'celtic_game_tree.png', table=TranspositionTable(),
+            max_depth=depth, stats=args.stats)
+
+
+def _explore(args):
+    from celtic.explore import LazyTree, serve
+
+    serve(LazyTree(size=args.size), args.host, args.port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m celtic')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def command(name, handler, help):
+        sub = commands.add_parser(name, help=help)
+        sub.set_defaults(handler=handler)
+        sub.add_argument('--size', type=int, default=engine.DEFAULT_SIZE, help='board size')
+        sub.add_argument('--stats', action='store_true',
+                         help='print counters and phase timings to stderr')
+        sub.add_argument('--profile', metavar='PATH',
+                         help='write a cProfile dump of the timed phases (implies --stats)')
+        return sub
+
+    def json_output(sub):
+        sub.add_argument('--output', '-o', help='JSON output file (default: stdout)')
+
+    enumerate_ = command('enumerate', _enumerate, 'count every position of the game tree')
+    enumerate_.add_argument('--depth', type=int, help='stop expanding at this many moves')
+    enumerate_.add_argument('--max-nodes', type=int, help='stop after this many positions (needs --workers 1)')
+    enumerate_.add_argument('--workers', type=int, default=1,
+                            help='worker processes, 0 for one per CPU (default: 1)')
+    enumerate_.add_argument('--split-depth', type=int, default=1,
+                            help='depth at which subtrees are handed to workers')
+    json_output(enumerate_)
+
+    solve = command('solve', _solve, 'search the initial position for the best move')
+    solve.add_argument('--depth', type=int, help='maximum search depth')
+    solve.add_argument('--max-nodes', type=int)
+    solve.add_argument('--time-limit', type=float, help='seconds')
+    solve.add_argument('--database', help='position database built by celtic.positiondb')
+    json_output(solve)
+
+    simulate = command('simulate', _simulate, 'play random games with NumPy playouts')
+    simulate.add_argument('--games', type=int, default=10000)
+    simulate.add_argument('--seed', type=int)
+    simulate.add_argument('--batch-size', type=int)
+    simulate.add_argument('--record', metavar='PATH',
+                          help='save every game to a celtic.records file')
+    simulate.add_argument('--append', action='store_true',
+                          help='add to an existing record file instead of replacing it')
+    json_output(simulate)
+
+    render = command('render', _render, 'draw the game tree with matplotlib')
+    render.add_argument('--style', choices=('tree', 'responses'), default='tree')
+    render.add_argument('--depth', type=int,
+                        help='stop expanding at this many moves (default: the whole tree '
+                             f'on 3x3, {RENDER_DEPTH} on larger boards)')
+    render.add_argument('--output', '-o',
+                        help='PNG file (default: celtic_game_tree.png for --style tree, '
+                             'an interactive window for --style responses)')
+
+    explore = command('explore', _explore, 'browse the tree in a local web viewer')
+    explore.add_argument('--host', default='127.0.0.1')
+    explore.add_argument('--port', type=int, default=8000)
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'max_nodes', None) is not None and getattr(args, 'workers', 1) != 1:
+        parser.error("--max-nodes only works with --workers 1")
+    if getattr(args, 'workers', None) == 0:
+        args.workers = None
+    try:
+        engine.geometry(args.size)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.stats or args.profile:
+        from celtic.stats import Stats
+
+        args.stats = Stats(args.profile)
+    else:
+        args.stats = None
+    args.handler(args)
+    if args.stats is not None:
+        print(args.stats.report(), file=sys.stderr)
+        if args.profile:
+            args.stats.dump_profile()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Stream a rendered game tree to disk as per-level image sheets.
+
+Every depth of the tree gets its own series of sheets, each a grid of
+board thumbnails in depth-first order. Only one open sheet per depth is
+held in memory, so output size and memory grow with the tree without
+building a single giant figure. A JSON manifest describes the layout and
+``nodes.csv`` maps every node to its parent and to its slot on a sheet.
+"""
+import csv
+import json
+import os
+
+import numpy as np
+
+from celtic import engine, images
+from celtic.render import get_array_renderer
+from celtic.tree import iter_nodes
+
+MANIFEST_VERSION = 1
+
+
+class _LevelSheets:
+    """The sheet currently being filled for one depth"""
+
+    def __init__(self, exporter, depth):
+        self.exporter = exporter
+        self.depth = depth
+        self.count = 0
+        self.sheets = []
+        self.sheet = None
+
+    def add(self, thumbnail):
+        exporter = self.exporter
+        slot = self.count % exporter.per_sheet
+        if slot == 0:
+            self.sheet = np.zeros(exporter.sheet_shape, dtype=np.uint8)
+        row, column = divmod(slot, exporter.columns)
+        y = row * exporter.cell + exporter.padding
+        x = column * exporter.cell + exporter.padding
+        side = thumbnail.shape[0]
+        self.sheet[y:y + side, x:x + side] = thumbnail
+        order = self.count
+        self.count += 1
+        if self.count % exporter.per_sheet == 0:
+            self.flush()
+        return order
+
+    def flush(self):
+        if self.sheet is None:
+            return
+        from PIL import Image
+
+        name = f"depth{self.depth:02d}_{len(self.sheets):05d}.png"
+        Image.fromarray(self.sheet).save(os.path.join(self.exporter.output_dir, name))
+        first = len(self.sheets) * self.exporter.per_sheet
+        self.sheets.append({'file': name, 'first': first, 'count': self.count - first})
+        self.sheet = None
+
+
+class TreeSheetExporter:
+    """Write tree thumbnails into fixed-size sheets under output_dir"""
+
+    def __init__(self, output_dir, size=engine.DEFAULT_SIZE, tile_size=20, columns=32, rows=32,
+                 padding=2, base_path=images.BASE_PATH):
+        self.output_dir = output_dir
+        self.size = size
+        self.columns = columns
+        self.rows = rows
+        self.padding = padding
+        self.per_sheet = columns * rows
+        self.board_pixels = size * tile_size
+        self.cell = self.board_pixels + 2 * padding
+        self.sheet_shape = (rows * self.cell, columns * self.cell, 3)
+        self.renderer = get_array_renderer(size, tile_size, base_path)
+        self.tile_size = tile_size
+        self.levels = []
+
+    def export(self, board=None, max_depth=None, max_nodes=None):
+        """Render every node and write sheets, nodes.csv and manifest.json"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Each export starts its sheet numbering and node counts afresh
+        self.levels = []
+        nodes = 0
+        with open(os.path.join(self.output_dir, 'nodes.csv'), 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(('index', 'parent', 'depth', 'order', 'cell', 'tile', 'rotation', 'key'))
+            for node, record in iter_nodes(board, self.size, max_depth, max_nodes):
+                depth = node.depth
+                while len(self.levels) <= depth:
+                    self.levels.append(_LevelSheets(self, len(self.levels)))
+                order = self.levels[depth].add(self.renderer.render(record.board))
+
+                cell, tile, rotation = node.move or ('', '', '')
+                writer.writerow((
+                    node.index, '' if node.parent is None else node.parent, depth, order,
+                    cell, engine.TILE_TYPES[tile] if node.move else '', rotation, node.key,
+                ))
+                nodes += 1
+
+        for level in self.levels:
+            level.flush()
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'size': self.size,
+            'tile_size': self.tile_size,
+            'nodes': nodes,
+            'layout': {
+                'columns': self.columns,
+                'rows': self.rows,
+                'padding': self.padding,
+                'cell_pixels': self.cell,
+                'board_pixels': self.board_pixels,
+                'order': 'row-major, depth-first within each depth',
+            },
+            'levels': [
+                {'depth': level.depth, 'nodes': level.count, 'sheets': level.sheets}
+                for level in self.levels
+            ],
+        }
+        with open(os.path.join(self.output_dir, 'manifest.json'), 'w') as handle:
+            json.dump(manifest, handle, indent=2)
+        return manifest
+
+
+def export_tree_sheets(output_dir, board=None, size=engine.DEFAULT_SIZE, max_depth=None,
+                       max_nodes=None, tile_size=20, columns=32, rows=32,
+                       base_path=images.BASE_PATH):
+    """Write the tree below board as per-level thumbnail sheets.
+
+    The node with ``order`` k at a given depth is on sheet k // (columns *
+    rows) of that depth, at slot k % (columns * rows) in row-major order.
+    Returns the manifest.
+    """
+    if board is not None:
+        size = board.size
+    exporter = TreeSheetExporter(output_dir, size, tile_size, columns, rows, base_path=base_path)
+    return exporter.export(board, max_depth, max_nodes)
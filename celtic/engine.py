@@ -0,0 +1,408 @@
+"""Compact bit-packed game state for the Celtic tile game."""
+from functools import lru_cache
+from itertools import islice
+
+TILE_TYPES = ('center', 'blue1', 'blue2', 'red1', 'red2')
+TILE_INDEX = {name: i for i, name in enumerate(TILE_TYPES)}
+PLAYER_TILES = {
+    'blue': (TILE_INDEX['blue1'], TILE_INDEX['blue2']),
+    'red': (TILE_INDEX['red1'], TILE_INDEX['red2']),
+}
+ROTATIONS = (0, 90, 180, 270)
+OUTCOMES = ('closed', 'blue_blocked', 'red_blocked')
+
+# Edge directions in the same order as Tile.edges: top, right, bottom, left
+TOP, RIGHT, BOTTOM, LEFT = 0, 1, 2, 3
+EDGE_NAMES = ('top', 'right', 'bottom', 'left')
+
+# Connector masks, bit d set when the edge in direction d is open
+TILE_EDGES = (
+    0b1111,  # center: all four edges
+    0b1100,  # blue1: bottom and left
+    0b0100,  # blue2: bottom only
+    0b1100,  # red1: bottom and left
+    0b0100,  # red2: bottom only
+)
+
+DEFAULT_SIZE = 3
+
+# Each cell stores 1 + tile * 4 + rotation_steps in CELL_BITS bits, 0 = empty
+CELL_BITS = 5
+CELL_MASK = (1 << CELL_BITS) - 1
+
+
+def pack_move(move):
+    """(cell, tile, rotation) as a 16-bit integer: cell << 5 | tile << 2 | steps"""
+    cell, tile, rotation = move
+    return (cell << 5) | (tile << 2) | (rotation // 90)
+
+
+def unpack_move(packed):
+    return packed >> 5, (packed >> 2) & 7, (packed & 3) * 90
+
+
+def rotate_mask(mask, rotation):
+    """Rotate a connector mask clockwise by rotation degrees"""
+    steps = (rotation // 90) % 4
+    return ((mask << steps) | (mask >> (4 - steps))) & 0xF
+
+
+# EDGE_TABLE[tile][rotation // 90] is the rotated connector mask
+EDGE_TABLE = tuple(
+    tuple(rotate_mask(mask, rotation) for rotation in ROTATIONS)
+    for mask in TILE_EDGES
+)
+
+
+def _distinct_rotations(tile):
+    rotations = []
+    seen = set()
+    for rotation in ROTATIONS:
+        mask = EDGE_TABLE[tile][rotation // 90]
+        if mask not in seen:
+            seen.add(mask)
+            rotations.append(rotation)
+    return tuple(rotations)
+
+
+# DISTINCT_ROTATIONS[tile] skips rotations that repeat an earlier edge mask,
+# so symmetric tiles like center only have a single rotation
+DISTINCT_ROTATIONS = tuple(_distinct_rotations(tile) for tile in range(len(TILE_TYPES)))
+
+# PLAYER_OPTIONS[player] lists the distinct (tile, rotation, mask) placements
+PLAYER_OPTIONS = {
+    player: tuple(
+        (tile, rotation, EDGE_TABLE[tile][rotation // 90])
+        for tile in tiles
+        for rotation in DISTINCT_ROTATIONS[tile]
+    )
+    for player, tiles in PLAYER_TILES.items()
+}
+
+
+def _legal_table(options):
+    """Legal option bitsets and placements for every cell constraint.
+
+    A cell's constraint is (fixed << 4) | required: ``fixed`` has a bit for
+    every edge facing the border or an occupied neighbour, ``required`` for
+    every one of those that must be open. An option with connector mask m
+    fits when (m ^ required) & fixed == 0.
+    """
+    bitsets = []
+    placements = []
+    for constraint in range(256):
+        fixed, required = constraint >> 4, constraint & 0xF
+        bits = 0
+        fitting = []
+        for index, (tile, rotation, mask) in enumerate(options):
+            if not (mask ^ required) & fixed:
+                bits |= 1 << index
+                fitting.append((tile, rotation))
+        bitsets.append(bits)
+        placements.append(tuple(fitting))
+    return tuple(bitsets), tuple(placements)
+
+
+# LEGAL_OPTIONS[player][constraint] is a bitset over PLAYER_OPTIONS[player],
+# LEGAL_PLACEMENTS[player][constraint] the matching (tile, rotation) pairs
+LEGAL_OPTIONS = {}
+LEGAL_PLACEMENTS = {}
+for _player, _options in PLAYER_OPTIONS.items():
+    LEGAL_OPTIONS[_player], LEGAL_PLACEMENTS[_player] = _legal_table(_options)
+
+
+class Geometry:
+    """Lookup tables for an NxN board, shared by every board of that size"""
+
+    __slots__ = ('size', 'cells', 'center', 'neighbours', 'border')
+
+    def __init__(self, size):
+        if size < 3 or size % 2 == 0:
+            raise ValueError(f"Board size must be odd and at least 3, got {size}")
+        self.size = size
+        self.cells = size * size
+        self.center = self.cell_index(size // 2, size // 2)
+
+        # neighbours[cell][direction] is the adjacent cell index or -1 at the border
+        neighbours = []
+        for cell in range(self.cells):
+            x, y = self.cell_coords(cell)
+            neighbours.append((
+                self.cell_index(x - 1, y) if x > 0 else -1,
+                self.cell_index(x, y + 1) if y < size - 1 else -1,
+                self.cell_index(x + 1, y) if x < size - 1 else -1,
+                self.cell_index(x, y - 1) if y > 0 else -1,
+            ))
+        self.neighbours = tuple(neighbours)
+
+        # border[cell] has bit d set when direction d faces the edge of the board
+        self.border = tuple(
+            sum(1 << d for d in range(4) if neighbours[cell][d] < 0)
+            for cell in range(self.cells)
+        )
+
+    def cell_index(self, x, y):
+        return x * self.size + y
+
+    def cell_coords(self, cell):
+        return divmod(cell, self.size)
+
+
+@lru_cache(maxsize=None)
+def geometry(size=DEFAULT_SIZE):
+    return Geometry(size)
+
+
+class Board:
+    """Board state packed into integers with O(1) make/unmake.
+
+    ``key`` holds the tile code of every cell and fully identifies the
+    position, so it can be used directly as a hashable snapshot.
+
+    The open frontier is kept incrementally: ``frontier`` has a bit for
+    every empty cell that an open edge points into, and ``required`` holds
+    a 4-bit mask per cell of the directions those edges come from.
+    ``adjacent`` holds a 4-bit mask per cell of the directions that have an
+    occupied neighbour, so a cell's legality constraint is read in O(1).
+    """
+
+    __slots__ = ('geometry', 'key', 'edges', 'occupied', 'count', 'frontier', 'required',
+                 'adjacent')
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self.geometry = geometry(size)
+        self.key = 0
+        self.edges = 0
+        self.occupied = 0
+        self.count = 0
+        self.frontier = 0
+        self.required = 0
+        self.adjacent = 0
+
+    @classmethod
+    def initial(cls, size=DEFAULT_SIZE):
+        board = cls(size)
+        board.place(board.geometry.center, TILE_INDEX['center'], 0)
+        return board
+
+    @classmethod
+    def from_key(cls, key, size=DEFAULT_SIZE):
+        board = cls(size)
+        for cell in range(board.geometry.cells):
+            code = (key >> (cell * CELL_BITS)) & CELL_MASK
+            if code:
+                board.place(cell, (code - 1) >> 2, ((code - 1) & 3) * 90)
+        return board
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.geometry = self.geometry
+        board.key = self.key
+        board.edges = self.edges
+        board.occupied = self.occupied
+        board.count = self.count
+        board.frontier = self.frontier
+        board.required = self.required
+        board.adjacent = self.adjacent
+        return board
+
+    @property
+    def size(self):
+        return self.geometry.size
+
+    @property
+    def player(self):
+        """Player to move, blue moves first after the center tile"""
+        return 'blue' if self.count % 2 else 'red'
+
+    def is_empty(self, cell):
+        return not (self.occupied >> cell) & 1
+
+    def tile_at(self, cell):
+        """Return (tile, rotation) for a cell, or None if it is empty"""
+        code = (self.key >> (cell * CELL_BITS)) & CELL_MASK
+        if not code:
+            return None
+        return (code - 1) >> 2, ((code - 1) & 3) * 90
+
+    def edges_at(self, cell):
+        return (self.edges >> (cell * 4)) & 0xF
+
+    def required_at(self, cell):
+        """Directions of the open edges pointing into an empty cell"""
+        return (self.required >> (cell * 4)) & 0xF
+
+    def place(self, cell, tile, rotation):
+        """Make a move, the cell must be empty"""
+        code = 1 + (tile << 2) + rotation // 90
+        edges = EDGE_TABLE[tile][rotation // 90]
+        self.key |= code << (cell * CELL_BITS)
+        self.edges |= edges << (cell * 4)
+        self.occupied |= 1 << cell
+        self.count += 1
+
+        # The cell leaves the frontier and its open edges extend it
+        self.frontier &= ~(1 << cell)
+        self.required &= ~(0xF << (cell * 4))
+        neighbours = self.geometry.neighbours[cell]
+        for direction in range(4):
+            neighbour = neighbours[direction]
+            if neighbour < 0:
+                continue
+            self.adjacent |= 1 << (neighbour * 4 + (direction ^ 2))
+            if edges >> direction & 1 and not (self.occupied >> neighbour) & 1:
+                self.frontier |= 1 << neighbour
+                self.required |= 1 << (neighbour * 4 + (direction ^ 2))
+
+    def remove(self, cell):
+        """Unmake the move at cell"""
+        edges = self.edges_at(cell)
+        self.key &= ~(CELL_MASK << (cell * CELL_BITS))
+        self.edges &= ~(0xF << (cell * 4))
+        self.occupied &= ~(1 << cell)
+        self.count -= 1
+
+        # Withdraw the cell's open edges from its empty neighbours, then
+        # rebuild the cell's own demand from the tiles around it
+        required = 0
+        neighbours = self.geometry.neighbours[cell]
+        for direction in range(4):
+            neighbour = neighbours[direction]
+            if neighbour < 0:
+                continue
+            self.adjacent &= ~(1 << (neighbour * 4 + (direction ^ 2)))
+            if (self.occupied >> neighbour) & 1:
+                if self.edges_at(neighbour) >> (direction ^ 2) & 1:
+                    required |= 1 << direction
+            elif edges >> direction & 1:
+                self.required &= ~(1 << (neighbour * 4 + (direction ^ 2)))
+                if not self.required_at(neighbour):
+                    self.frontier &= ~(1 << neighbour)
+        if required:
+            self.required |= required << (cell * 4)
+            self.frontier |= 1 << cell
+
+    def frontier_cells(self):
+        """Empty cells that at least one open edge points into"""
+        cells = []
+        frontier = self.frontier
+        while frontier:
+            low = frontier & -frontier
+            cells.append(low.bit_length() - 1)
+            frontier ^= low
+        return cells
+
+    def open_edges(self):
+        """Find (cell, required_direction) for every open edge facing an empty cell"""
+        open_positions = []
+        for cell in self.frontier_cells():
+            required = self.required_at(cell)
+            for direction in range(4):
+                if required >> direction & 1:
+                    open_positions.append((cell, direction))
+        return open_positions
+
+    def constraint(self, cell):
+        """(fixed << 4) | required edge masks of a cell, see LEGAL_OPTIONS"""
+        fixed = self.geometry.border[cell] | (self.adjacent >> (cell * 4)) & 0xF
+        return fixed << 4 | (self.required >> (cell * 4)) & 0xF
+
+    def legal_options(self, cell, player=None):
+        """Bitset over PLAYER_OPTIONS[player] of the placements legal at cell.
+
+        A placement is legal on an empty cell that an open edge points into
+        when no open edge faces the border and every edge matches the
+        facing edge of each occupied neighbour.
+        """
+        if not (self.frontier >> cell) & 1:
+            return 0
+        return LEGAL_OPTIONS[player or self.player][self.constraint(cell)]
+
+    def can_place(self, cell, tile, rotation):
+        """Check if a tile can legally be placed at cell with the given rotation"""
+        if not (self.frontier >> cell) & 1:
+            return False
+        fixed_required = self.constraint(cell)
+        mask = EDGE_TABLE[tile][rotation // 90]
+        return not (mask ^ fixed_required) & (fixed_required >> 4)
+
+    def first_fit(self, cell, player=None):
+        """First (tile, rotation) of player that fits at cell, or None"""
+        if not (self.frontier >> cell) & 1:
+            return None
+        placements = LEGAL_PLACEMENTS[player or self.player][self.constraint(cell)]
+        return placements[0] if placements else None
+
+    def legal_moves(self, player=None):
+        """List (cell, tile, rotation) moves for player on the frontier"""
+        table = LEGAL_PLACEMENTS[player or self.player]
+        border = self.geometry.border
+        adjacent = self.adjacent
+        required = self.required
+        moves = []
+        frontier = self.frontier
+        while frontier:
+            low = frontier & -frontier
+            frontier ^= low
+            cell = low.bit_length() - 1
+            shift = cell * 4
+            fixed = border[cell] | (adjacent >> shift) & 0xF
+            for tile, rotation in table[fixed << 4 | (required >> shift) & 0xF]:
+                moves.append((cell, tile, rotation))
+        return moves
+
+    def iter_moves(self, player=None):
+        """Yield the moves of legal_moves one at a time, in the same order.
+
+        The board must not change while the generator is being consumed.
+        """
+        table = LEGAL_PLACEMENTS[player or self.player]
+        frontier = self.frontier
+        while frontier:
+            low = frontier & -frontier
+            frontier ^= low
+            cell = low.bit_length() - 1
+            for tile, rotation in table[self.constraint(cell)]:
+                yield cell, tile, rotation
+
+    def has_any_move(self, player=None):
+        """Whether player has a legal move, stopping at the first fitting cell"""
+        table = LEGAL_OPTIONS[player or self.player]
+        frontier = self.frontier
+        while frontier:
+            low = frontier & -frontier
+            frontier ^= low
+            if table[self.constraint(low.bit_length() - 1)]:
+                return True
+        return False
+
+    def count_moves(self, player=None):
+        """Number of legal moves for player, without building the list"""
+        table = LEGAL_PLACEMENTS[player or self.player]
+        count = 0
+        frontier = self.frontier
+        while frontier:
+            low = frontier & -frontier
+            frontier ^= low
+            count += len(table[self.constraint(low.bit_length() - 1)])
+        return count
+
+    def first_k(self, k, player=None):
+        """List of at most the first k moves of legal_moves"""
+        return list(islice(self.iter_moves(player), k))
+
+    def leaf_outcome(self):
+        """How the game ended, for a position with no legal moves.
+
+        'closed' when no open edge is left, otherwise '<player>_blocked'
+        for the player to move, who cannot fill any open edge.
+        """
+        if not self.frontier:
+            return 'closed'
+        return f'{self.player}_blocked'
+
+    def outcome(self):
+        """Outcome of a finished game, or None while the player to move has a move"""
+        if self.has_any_move():
+            return None
+        return self.leaf_outcome()
@@ -0,0 +1,101 @@
+"""Structured game events with levels, sampling and JSON Lines records.
+
+Games emit events only when an EventLog is attached, so bulk runs without
+one pay a single None check per move. An EventLog keeps the most recent
+records in a ring buffer, passes them to a callback and/or writes them as
+one JSON object per line. A log of every 'placed' event is a replayable
+game record, see replay().
+"""
+import json
+from collections import deque
+
+from celtic import engine
+
+DEBUG, INFO, WARNING = 10, 20, 30
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning'}
+
+DEFAULT_CAPACITY = 1024
+
+
+class EventLog:
+    """Sink for game events.
+
+    Events below ``level`` are dropped. Of the events at DEBUG or INFO
+    level only every ``sample_every``-th one of each kind is recorded;
+    warnings are always kept. Recorded events are dicts with ``seq``,
+    ``level`` and ``event`` keys plus the event's fields. They go to the
+    ring buffer ``records`` (at most ``capacity``, None for no buffer),
+    to ``callback`` and, as JSON Lines, to ``stream``.
+    """
+
+    def __init__(self, level=INFO, sample_every=1, capacity=DEFAULT_CAPACITY, callback=None,
+                 stream=None):
+        self.level = level
+        self.sample_every = sample_every
+        self.records = deque(maxlen=capacity) if capacity else None
+        self.callback = callback
+        self.stream = stream
+        self.seq = 0
+        self.dropped = 0
+        self._seen = {}
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def emit(self, event, level=INFO, **fields):
+        if level < self.level:
+            return
+        self.seq += 1
+        if level < WARNING and self.sample_every > 1:
+            seen = self._seen.get(event, 0)
+            self._seen[event] = seen + 1
+            if seen % self.sample_every:
+                self.dropped += 1
+                return
+
+        record = {'seq': self.seq, 'level': LEVEL_NAMES.get(level, level), 'event': event}
+        record.update(fields)
+        if self.records is not None:
+            self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+        if self.stream is not None:
+            self.stream.write(json.dumps(record) + '\n')
+
+    def clear(self):
+        if self.records is not None:
+            self.records.clear()
+        self.seq = self.dropped = 0
+        self._seen.clear()
+
+
+def read_jsonl(path):
+    """Yield the records of a JSON Lines event file"""
+    with open(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def replay(records, size=None):
+    """Rebuild the position a sequence of event records leads to.
+
+    Every 'placed' record is applied in order; a 'new_game' record starts
+    over on an empty board of its size. The moves after the center tile
+    must be legal, so a truncated or sampled log raises ValueError.
+    """
+    board = engine.Board(size or engine.DEFAULT_SIZE)
+    for record in records:
+        event = record['event']
+        if event == 'new_game':
+            board = engine.Board(record['size'])
+        elif event == 'placed':
+            cell = board.geometry.cell_index(record['x'], record['y'])
+            tile = engine.TILE_INDEX[record['tile']]
+            rotation = record['rotation']
+            if board.count and not board.can_place(cell, tile, rotation):
+                raise ValueError(f"Illegal move in record {record['seq']}: {record}")
+            board.place(cell, tile, rotation)
+    return board
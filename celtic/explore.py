@@ -0,0 +1,230 @@
+"""Lazily expanded game tree and a small local viewer for it.
+
+LazyTree only generates the children of a position when they are asked
+for and remembers them per position key, so transpositions share one
+expansion. Board images are composed on request and the encoded PNGs are
+kept in an LRU cache.
+
+Browse a tree with::
+
+    python -m celtic explore --size 5 --port 8000
+
+and open http://127.0.0.1:8000/ ; every click expands one node.
+"""
+import json
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from celtic import engine, images
+from celtic.lru import LRUCache
+
+# Encoded node images kept by a LazyTree
+MAX_IMAGES = 1024
+
+# One node of the tree as seen from the root. path is the tuple of child
+# indices leading here, move the (cell, tile, rotation) that was played.
+LazyNode = namedtuple('LazyNode', 'path key move')
+
+
+class LazyTree:
+    """Game tree below a position, expanded one node at a time.
+
+    Nodes are addressed by their path of child indices from the root, so a
+    viewer can ask for any node without holding the nodes above it.
+    """
+
+    def __init__(self, board=None, size=engine.DEFAULT_SIZE, base_path=images.BASE_PATH,
+                 max_images=MAX_IMAGES):
+        if board is None:
+            board = engine.Board.initial(size)
+        self.size = board.size
+        self.root = LazyNode((), board.key, None)
+        self.base_path = base_path
+        self.max_images = max_images
+        self.expansions = 0
+        self._children = {}
+        self._images = LRUCache(max_images)
+
+    def board(self, node):
+        return engine.Board.from_key(node.key, self.size)
+
+    def moves(self, key):
+        """Legal moves and resulting keys of a position, computed once per key"""
+        moves = self._children.get(key)
+        if moves is None:
+            board = engine.Board.from_key(key, self.size)
+            moves = []
+            for move in board.iter_moves():
+                board.place(*move)
+                moves.append((move, board.key))
+                board.remove(move[0])
+            moves = self._children[key] = tuple(moves)
+            self.expansions += 1
+        return moves
+
+    def children(self, node):
+        return [
+            LazyNode(node.path + (index,), key, move)
+            for index, (move, key) in enumerate(self.moves(node.key))
+        ]
+
+    def node(self, path):
+        """Node at a path of child indices; IndexError if there is none"""
+        node = self.root
+        for index in path:
+            if index < 0:
+                raise IndexError(f"Negative child index {index}")
+            move, key = self.moves(node.key)[index]
+            node = LazyNode(node.path + (index,), key, move)
+        return node
+
+    def describe(self, node):
+        """JSON-ready summary of a node and its children"""
+        board = self.board(node)
+        geometry = board.geometry
+
+        def move_info(move):
+            cell, tile, rotation = move
+            x, y = geometry.cell_coords(cell)
+            return {'x': x, 'y': y, 'tile': engine.TILE_TYPES[tile], 'rotation': rotation}
+
+        return {
+            'path': list(node.path),
+            'key': format(node.key, 'x'),
+            'depth': len(node.path),
+            'player': board.player,
+            'move': move_info(node.move) if node.move else None,
+            'outcome': board.outcome(),
+            'children': [
+                {'path': list(child.path), 'key': format(child.key, 'x'),
+                 'move': move_info(child.move)}
+                for child in self.children(node)
+            ],
+        }
+
+    def image(self, key, tile_size=60):
+        """PNG bytes of a position, rendered on first request"""
+        cache_key = (key, tile_size)
+        data = self._images.get(cache_key)
+        if data is not None:
+            return data
+
+        import io
+
+        from PIL import Image
+
+        from celtic.render import get_array_renderer
+
+        renderer = get_array_renderer(self.size, tile_size, self.base_path)
+        stream = io.BytesIO()
+        Image.fromarray(renderer.render_key(key)).save(stream, format='PNG')
+        data = stream.getvalue()
+        self._images.put(cache_key, data)
+        return data
+
+
+_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Celtic game tree</title>
+<style>
+body { background: #111; color: #eee; font-family: sans-serif; margin: 1em; }
+a { color: #9cf; cursor: pointer; }
+#children { display: flex; flex-wrap: wrap; gap: 12px; }
+.child { text-align: center; font-size: 12px; }
+.child img { display: block; border: 1px solid #444; }
+</style></head>
+<body>
+<div id="trail"></div>
+<h3 id="title"></h3>
+<img id="board">
+<h4 id="count"></h4>
+<div id="children"></div>
+<script>
+function label(move) {
+  return move ? `${move.tile} (${move.x},${move.y}) ${move.rotation}\\u00b0` : 'Initial board';
+}
+async function show(path) {
+  const node = await (await fetch('/api/node?path=' + path.join('.'))).json();
+  document.getElementById('title').textContent =
+    `${label(node.move)} - depth ${node.depth}, ` +
+    (node.outcome ? `game over: ${node.outcome}` : `${node.player} to move`);
+  document.getElementById('board').src = `/image/${node.key}.png?tile=80`;
+  const trail = document.getElementById('trail');
+  trail.replaceChildren();
+  for (let i = 0; i <= path.length; i++) {
+    const link = document.createElement('a');
+    link.textContent = i ? path[i - 1] : 'root';
+    link.onclick = () => show(path.slice(0, i));
+    trail.append(link, ' / ');
+  }
+  document.getElementById('count').textContent = `${node.children.length} moves`;
+  const list = document.getElementById('children');
+  list.replaceChildren();
+  for (const child of node.children) {
+    const item = document.createElement('a');
+    item.className = 'child';
+    item.onclick = () => show(child.path);
+    const img = document.createElement('img');
+    img.loading = 'lazy';
+    img.src = `/image/${child.key}.png?tile=40`;
+    item.append(img, label(child.move));
+    list.append(item);
+  }
+}
+show([]);
+</script></body></html>
+"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    tree = None
+
+    def _send(self, status, content_type, body, cache=False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if cache:
+            self.send_header('Cache-Control', 'max-age=86400')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == '/':
+                self._send(200, 'text/html; charset=utf-8', _PAGE.encode())
+            elif url.path == '/api/node':
+                text = query.get('path', [''])[0]
+                path = tuple(int(index) for index in text.split('.') if index)
+                node = self.tree.node(path)
+                body = json.dumps(self.tree.describe(node)).encode()
+                self._send(200, 'application/json', body)
+            elif url.path.startswith('/image/') and url.path.endswith('.png'):
+                key = int(url.path[len('/image/'):-len('.png')], 16)
+                tile_size = min(200, max(8, int(query.get('tile', ['60'])[0])))
+                self._send(200, 'image/png', self.tree.image(key, tile_size), cache=True)
+            else:
+                self._send(404, 'text/plain', b'not found')
+        except (ValueError, IndexError) as error:
+            self._send(400, 'text/plain', str(error).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(tree, host='127.0.0.1', port=8000):
+    """Serve the viewer for tree until interrupted.
+
+    Requests are handled one at a time: the tree's caches and the shared
+    render buffer are not thread safe.
+    """
+    handler = type('Handler', (_Handler,), {'tree': tree})
+    server = HTTPServer((host, port), handler)
+    print(f"Serving the {tree.size}x{tree.size} game tree at http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
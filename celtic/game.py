@@ -0,0 +1,205 @@
+import os
+import random
+from itertools import islice
+
+from celtic import engine, images
+from celtic.events import DEBUG, INFO
+
+
+class Tile:
+    def __init__(self, image_path, edges, tile_type):
+        self.image_path = image_path
+        self.edges = edges
+        self.rotation = 0
+        self.tile_type = tile_type
+
+    @property
+    def original_image(self):
+        return images.get_cache(os.path.dirname(self.image_path)).original(self.tile_type)
+
+    def get_rotated_edges(self):
+        rotation_steps = self.rotation // 90
+        return self.edges[-rotation_steps:] + self.edges[:-rotation_steps]
+
+    def get_rotated_image(self, size):
+        cache = images.get_cache(os.path.dirname(self.image_path))
+        return cache.get(self.tile_type, size, self.rotation)
+
+
+class CelticGame:
+    def __init__(self, size=engine.DEFAULT_SIZE, events=None):
+        self.base_path = images.BASE_PATH
+        self.current_player = 'blue'
+        self.state = engine.Board(size)
+        # Optional celtic.events.EventLog; games are silent without one
+        self.events = events
+        if events is not None:
+            events.emit('new_game', size=size)
+
+        # Initialize tile types
+        self.tile_types = {
+            'center': Tile(
+                os.path.join(self.base_path, "centertile.PNG"),
+                [True, True, True, True],
+                'center'
+            ),
+            'blue1': Tile(
+                os.path.join(self.base_path, "bluetile1.PNG"),
+                [False, False, True, True],
+                'blue1'
+            ),
+            'blue2': Tile(
+                os.path.join(self.base_path, "bluetile2.PNG"),
+                [False, False, True, False],
+                'blue2'
+            ),
+            'red1': Tile(
+                os.path.join(self.base_path, "redtile1PNG.PNG"),
+                [False, False, True, True],
+                'red1'
+            ),
+            'red2': Tile(
+                os.path.join(self.base_path, "redtile2.PNG"),
+                [False, False, True, False],
+                'red2'
+            )
+        }
+
+        # Place center tile
+        self.place_center_tile()
+
+    @property
+    def size(self):
+        return self.state.size
+
+    def place_center_tile(self):
+        center = self.size // 2
+        self.place_tile(center, center, 'center', 0)
+        if self.events is not None:
+            self.events.emit('placed', player=None, x=center, y=center, tile='center', rotation=0)
+
+    def copy(self):
+        """Copy the game, sharing the loaded tile images"""
+        game = type(self).__new__(type(self))
+        game.__dict__.update(self.__dict__)
+        game.state = self.state.copy()
+        return game
+
+    @property
+    def board(self):
+        """Tile type names as a grid, None for empty cells"""
+        size = self.size
+        grid = [[None] * size for _ in range(size)]
+        for cell in range(size * size):
+            placed = self.state.tile_at(cell)
+            if placed:
+                x, y = self.state.geometry.cell_coords(cell)
+                grid[x][y] = engine.TILE_TYPES[placed[0]]
+        return grid
+
+    def rotated_edges(self, x, y):
+        """Edges of the tile at (x, y) as [top, right, bottom, left]"""
+        mask = self.state.edges_at(self.state.geometry.cell_index(x, y))
+        return [bool(mask >> d & 1) for d in range(4)]
+
+    def place_tile(self, x, y, tile_type, rotation):
+        """Place a tile, replacing whatever occupies the cell"""
+        cell = self.state.geometry.cell_index(x, y)
+        if not self.state.is_empty(cell):
+            self.state.remove(cell)
+        self.state.place(cell, engine.TILE_INDEX[tile_type], rotation)
+
+    def remove_tile(self, x, y):
+        cell = self.state.geometry.cell_index(x, y)
+        if not self.state.is_empty(cell):
+            self.state.remove(cell)
+
+    def find_open_edges(self):
+        """Find all positions with open edges"""
+        open_positions = []
+        for cell, direction in self.state.open_edges():
+            x, y = self.state.geometry.cell_coords(cell)
+            open_positions.append((x, y, engine.EDGE_NAMES[direction]))
+        return open_positions
+
+    def can_place_tile(self, x, y, tile, rotation):
+        """Check if a tile can be placed at position with given rotation"""
+        return self.state.can_place(
+            self.state.geometry.cell_index(x, y), engine.TILE_INDEX[tile.tile_type], rotation
+        )
+
+    def iter_legal_moves(self, player=None):
+        """Yield (x, y, tile_type, rotation) moves read from the live frontier"""
+        for cell, tile, rotation in self.state.iter_moves(player or self.current_player):
+            x, y = self.state.geometry.cell_coords(cell)
+            yield x, y, engine.TILE_TYPES[tile], rotation
+
+    def legal_moves(self, player=None, limit=None):
+        """List (x, y, tile_type, rotation) moves, at most limit of them"""
+        return list(islice(self.iter_legal_moves(player), limit))
+
+    def build_from_edges(self, choose_move=None):
+        """Play until no open edge is left or the player to move is stuck.
+
+        By default each placement fills a random open position. Pass
+        choose_move, e.g. celtic.solver.best_move, to pick the moves from
+        the engine state instead; it returns (cell, tile, rotation) or None.
+        Placements, dead ends and the outcome go to the game's EventLog.
+        """
+        events = self.events
+        while True:
+            open_cells = self.state.frontier_cells()
+            if not open_cells:
+                break
+
+            if choose_move is not None:
+                move = choose_move(self.state)
+                if move is None:
+                    break
+                cell, tile, rotation = move
+            else:
+                # Choose random open position
+                cell = random.choice(open_cells)
+                tile, rotation = self.state.first_fit(cell, self.current_player) or (None, None)
+
+            if tile is not None:
+                self.state.place(cell, tile, rotation)
+                if events is not None:
+                    x, y = self.state.geometry.cell_coords(cell)
+                    events.emit('placed', player=self.current_player, x=x, y=y,
+                                tile=engine.TILE_TYPES[tile], rotation=rotation)
+                self.current_player = 'red' if self.current_player == 'blue' else 'blue'
+            else:
+                if events is not None and events.enabled(DEBUG):
+                    x, y = self.state.geometry.cell_coords(cell)
+                    events.emit('dead_end', DEBUG, player=self.current_player, x=x, y=y)
+                if not self.state.has_any_move(self.current_player):
+                    break
+
+        if events is not None:
+            events.emit('game_over', INFO, outcome=self.state.outcome(),
+                        moves=self.state.count - 1)
+
+    def create_board_image(self, tile_size=100):
+        from celtic import render
+
+        return render.get_renderer(self.base_path).render(self.state, tile_size).copy()
+
+    def create_board_array(self, tile_size=100):
+        """Board as an RGB uint8 array, composed without PIL images"""
+        from celtic import render
+
+        renderer = render.get_array_renderer(self.size, tile_size, self.base_path)
+        return renderer.render(self.state).copy()
+
+    def is_legal_move(self, x, y, tile, rotation):
+        """Check if placing tile at (x,y) with given rotation is legal.
+
+        Same rule as can_place_tile: the cell must be empty and reached by
+        an open edge, no open edge may face the border, and every edge must
+        match the facing edge of each occupied neighbour.
+        """
+        last = self.size - 1
+        if not (0 <= x <= last and 0 <= y <= last):
+            return False
+        return self.can_place_tile(x, y, tile, rotation)
@@ -0,0 +1,170 @@
+"""Export the game tree as a graph file (DOT, GraphML or JSON Lines).
+
+Nodes are identified by their position hash, the packed board key in hex,
+so a position reached by several move orders is written once and the
+export is a DAG. Records are written as the tree is walked; only the set
+of position keys already written is kept in memory.
+
+Each node carries its key, depth, player to move and the move that first
+reached it; every edge carries its move as (cell, x, y, tile_type,
+rotation). With thumbnails enabled, each node's board is rendered once to
+``thumbnails/<hash>.png`` next to the graph file and referenced by path.
+"""
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+from celtic import engine, images
+from celtic.tree import iter_nodes
+
+FORMATS = ('dot', 'graphml', 'jsonl')
+
+
+def position_hash(key):
+    return f"{key:x}"
+
+
+class _DotWriter:
+    def __init__(self, handle):
+        self.handle = handle
+        handle.write('digraph celtic {\n  node [shape=box];\n')
+
+    def node(self, node_id, attributes):
+        label = f"{attributes['player']} to move\\ndepth {attributes['depth']}"
+        # Graphviz draws a node's picture from its image attribute
+        extra = ''.join(
+            f' {"image" if name == "thumbnail" else name}={json.dumps(str(value))}'
+            for name, value in attributes.items() if value is not None
+        )
+        self.handle.write(f'  "{node_id}" [label="{label}"{extra}];\n')
+
+    def edge(self, source, target, move):
+        label = f"{move['tile_type']} ({move['x']},{move['y']}) {move['rotation']}"
+        self.handle.write(f'  "{source}" -> "{target}" [label="{label}"];\n')
+
+    def close(self):
+        self.handle.write('}\n')
+
+
+_GRAPHML_NODE_KEYS = ('key', 'depth', 'player', 'move', 'thumbnail')
+_GRAPHML_EDGE_KEYS = ('cell', 'x', 'y', 'tile_type', 'rotation')
+
+
+class _GraphMLWriter:
+    def __init__(self, handle):
+        self.handle = handle
+        handle.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                     '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        for name in _GRAPHML_NODE_KEYS:
+            handle.write(f'  <key id="n_{name}" for="node" attr.name="{name}" attr.type="string"/>\n')
+        for name in _GRAPHML_EDGE_KEYS:
+            handle.write(f'  <key id="e_{name}" for="edge" attr.name="{name}" attr.type="string"/>\n')
+        handle.write('  <graph id="celtic" edgedefault="directed">\n')
+
+    def node(self, node_id, attributes):
+        self.handle.write(f'    <node id="{node_id}">')
+        for name in _GRAPHML_NODE_KEYS:
+            value = attributes.get(name)
+            if value is not None:
+                self.handle.write(f'<data key="n_{name}">{escape(str(value))}</data>')
+        self.handle.write('</node>\n')
+
+    def edge(self, source, target, move):
+        self.handle.write(f'    <edge source={quoteattr(source)} target={quoteattr(target)}>')
+        for name in _GRAPHML_EDGE_KEYS:
+            self.handle.write(f'<data key="e_{name}">{escape(str(move[name]))}</data>')
+        self.handle.write('</edge>\n')
+
+    def close(self):
+        self.handle.write('  </graph>\n</graphml>\n')
+
+
+class _JsonlWriter:
+    def __init__(self, handle):
+        self.handle = handle
+
+    def node(self, node_id, attributes):
+        self.handle.write(json.dumps({'type': 'node', 'id': node_id, **attributes}) + '\n')
+
+    def edge(self, source, target, move):
+        self.handle.write(json.dumps({'type': 'edge', 'source': source, 'target': target,
+                                      **move}) + '\n')
+
+    def close(self):
+        pass
+
+
+_WRITERS = {'dot': _DotWriter, 'graphml': _GraphMLWriter, 'jsonl': _JsonlWriter}
+
+
+def export_graph(output_path, board=None, size=engine.DEFAULT_SIZE, fmt=None, max_depth=None,
+                 max_nodes=None, thumbnails=False, tile_size=20, base_path=images.BASE_PATH):
+    """Write the game DAG below board to output_path.
+
+    ``fmt`` is one of FORMATS and defaults to the file extension. Returns
+    a dict with the number of nodes and edges written.
+    """
+    if fmt is None:
+        fmt = os.path.splitext(output_path)[1].lstrip('.').lower()
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown graph format: {fmt!r}, expected one of {FORMATS}")
+    if board is not None:
+        size = board.size
+    geometry = engine.geometry(size)
+
+    renderer = thumbnail_dir = None
+    if thumbnails:
+        from PIL import Image
+
+        from celtic.render import get_array_renderer
+
+        renderer = get_array_renderer(size, tile_size, base_path)
+        thumbnail_dir = os.path.join(os.path.dirname(os.path.abspath(output_path)), 'thumbnails')
+        os.makedirs(thumbnail_dir, exist_ok=True)
+
+    written = set()
+    # Position hash of every node so far, by TreeNode index
+    ids = []
+    edges = 0
+
+    def unseen(position):
+        # Positions already written have had their subtree written too
+        return position.key not in written
+
+    with open(output_path, 'w', encoding='utf-8') as handle:
+        writer = _WRITERS[fmt](handle)
+        records = iter_nodes(board, size, max_depth, max_nodes, should_expand=unseen)
+        for node, record in records:
+            position = record.board
+            node_id = position_hash(node.key)
+            ids.append(node_id)
+
+            move = None
+            if node.move:
+                cell, tile, rotation = node.move
+                x, y = geometry.cell_coords(cell)
+                move = {'cell': cell, 'x': x, 'y': y,
+                        'tile_type': engine.TILE_TYPES[tile], 'rotation': rotation}
+                writer.edge(ids[node.parent], node_id, move)
+                edges += 1
+
+            if position.key in written:
+                continue
+            written.add(position.key)
+
+            thumbnail = None
+            if renderer is not None:
+                thumbnail = os.path.join('thumbnails', f"{node_id}.png")
+                Image.fromarray(renderer.render(position)).save(
+                    os.path.join(thumbnail_dir, f"{node_id}.png"))
+            writer.node(node_id, {
+                'key': position.key,
+                'depth': node.depth,
+                'player': position.player,
+                'move': None if move is None else
+                f"{move['x']},{move['y']},{move['tile_type']},{move['rotation']}",
+                'thumbnail': thumbnail,
+            })
+        writer.close()
+
+    return {'nodes': len(written), 'edges': edges}
@@ -0,0 +1,81 @@
+"""Lazy, process-wide cache of tile images.
+
+Only rendering code touches this module, and PIL is imported on the first
+image load, so the rules engine and headless analysis never read from disk.
+"""
+import os
+
+from celtic.lru import LRUCache
+
+# The tile images ship in images/ next to the package; CELTIC_IMAGES overrides it
+BASE_PATH = os.environ.get(
+    'CELTIC_IMAGES',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'images'),
+)
+
+IMAGE_FILES = {
+    'center': "centertile.PNG",
+    'blue1': "bluetile1.PNG",
+    'blue2': "bluetile2.PNG",
+    'red1': "redtile1PNG.PNG",
+    'red2': "redtile2.PNG",
+}
+
+# Resized/rotated images kept per cache
+MAX_IMAGES = 256
+
+
+class TileImageCache:
+    """LRU cache of tile images keyed by (tile_type, size, rotation)"""
+
+    def __init__(self, base_path=BASE_PATH, max_images=MAX_IMAGES):
+        self.base_path = base_path
+        self.max_images = max_images
+        self._originals = {}
+        self._images = LRUCache(max_images)
+
+    @property
+    def hits(self):
+        return self._images.hits
+
+    @property
+    def misses(self):
+        return self._images.misses
+
+    def path(self, tile_type):
+        return os.path.join(self.base_path, IMAGE_FILES[tile_type])
+
+    def original(self, tile_type):
+        """Full size image for a tile type, opened on first use"""
+        image = self._originals.get(tile_type)
+        if image is None:
+            from PIL import Image
+
+            image = Image.open(self.path(tile_type))
+            image.load()
+            self._originals[tile_type] = image
+        return image
+
+    def get(self, tile_type, size, rotation=0):
+        """Tile image resized to size x size and rotated clockwise"""
+        key = (tile_type, size, rotation)
+        image = self._images.get(key)
+        if image is None:
+            image = self.original(tile_type).resize((size, size)).rotate(-rotation)
+            self._images.put(key, image)
+        return image
+
+    def clear(self):
+        self._originals.clear()
+        self._images.clear()
+
+
+_caches = {}
+
+
+def get_cache(base_path=BASE_PATH):
+    """Shared cache for an image directory"""
+    cache = _caches.get(base_path)
+    if cache is None:
+        cache = _caches[base_path] = TileImageCache(base_path)
+    return cache
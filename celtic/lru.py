@@ -0,0 +1,59 @@
+"""Bounded least-recently-used cache shared by the renderers and search."""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Map keys to values, keeping at most max_entries of them.
+
+    A full cache drops the least recently used entry on insertion, or the
+    oldest insertion when ``lru`` is False. get() counts hits and misses
+    and marks a hit as recently used; peek() does neither. None is not a
+    storable value, since get() returns it for a miss.
+    """
+
+    def __init__(self, max_entries, lru=True):
+        self.max_entries = max_entries
+        self.lru = lru
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return the value for a key, or None on a miss"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.lru:
+            self._entries.move_to_end(key)
+        return value
+
+    def peek(self, key):
+        """Return the value for a key without counting or reordering"""
+        return self._entries.get(key)
+
+    def put(self, key, value):
+        """Store a value; return True if the key was not in the cache"""
+        entries = self._entries
+        if key in entries:
+            entries[key] = value
+            if self.lru:
+                entries.move_to_end(key)
+            return False
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,119 @@
+"""Monte Carlo tree search (UCT) with random build_from_edges playouts."""
+import math
+import random
+import time
+
+from celtic.playout import random_playout, reward
+
+
+class Node:
+    """Search node for the position reached by move.
+
+    ``wins`` is accumulated from the point of view of the player who made
+    the move into this node.
+    """
+
+    __slots__ = ('move', 'parent', 'key', 'player', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, board, move=None, parent=None):
+        self.move = move
+        self.parent = parent
+        self.key = board.key
+        # The player who moved into this node is the opponent of the one to move
+        self.player = 'red' if board.player == 'blue' else 'blue'
+        self.children = []
+        self.untried = board.legal_moves()
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+class MCTS:
+    """UCT search that stops after ``iterations`` or ``time_limit`` seconds.
+
+    The tree is kept between calls to search(): when the new position is a
+    child or grandchild of the previous root, that subtree and its
+    statistics are reused.
+    """
+
+    def __init__(self, iterations=None, time_limit=None, exploration=math.sqrt(2), seed=None):
+        if iterations is None and time_limit is None:
+            iterations = 1000
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.root = None
+        self.reused = 0
+
+    def _find_root(self, board):
+        if self.root is None:
+            return None
+        if self.root.key == board.key:
+            return self.root
+        for child in self.root.children:
+            if child.key == board.key:
+                return child
+            for grandchild in child.children:
+                if grandchild.key == board.key:
+                    return grandchild
+        return None
+
+    def search(self, board):
+        """Run the search from board and return the most visited move, or None"""
+        root = self._find_root(board)
+        if root is None:
+            root = Node(board)
+        else:
+            self.reused += root.visits
+        root.parent = None
+        self.root = root
+
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        iteration = 0
+        while True:
+            if self.iterations is not None and iteration >= self.iterations:
+                break
+            if deadline is not None and not iteration & 63 and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, board.copy())
+            iteration += 1
+
+        if not root.children:
+            return None
+        return max(root.children, key=lambda child: child.visits).move
+
+    def _iterate(self, node, board):
+        # Selection
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+            board.place(*node.move)
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            board.place(*move)
+            child = Node(board, move, node)
+            node.children.append(child)
+            node = child
+
+        # Simulation
+        outcome = random_playout(board, self.rng)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            node.wins += reward(outcome, node.player)
+            node = node.parent
+
+
+def best_move(state, iterations=None, time_limit=None, seed=None):
+    """Best (cell, tile, rotation) for the player to move, or None if stuck"""
+    return MCTS(iterations, time_limit, seed=seed).search(state)
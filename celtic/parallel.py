@@ -0,0 +1,131 @@
+"""Split tree search across a process pool.
+
+The tree is walked in-process down to ``split_depth``; every position
+reached there becomes an independent shard for a worker. Positions that
+are symmetric images of each other share one shard, weighted by how often
+they occur. Shards are submitted and merged in move-generation order, so
+the results do not depend on the number of workers or their scheduling.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from celtic import engine
+from celtic.transposition import DEFAULT_MAX_ENTRIES, TranspositionTable
+from celtic.tree import SubtreeSummary, enumerate_tree, iter_tree, summarize_subtree
+
+TABLE_COUNTERS = ('entries', 'hits', 'misses', 'stores', 'evictions')
+
+
+def _run(function, tasks, workers):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return [function(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def _enumerate_shard(task):
+    key, size, max_depth = task
+    return enumerate_tree(engine.Board.from_key(key, size), max_depth=max_depth)
+
+
+def parallel_enumerate(board=None, size=engine.DEFAULT_SIZE, split_depth=1, workers=None,
+                       max_depth=None, stats=None):
+    """enumerate_tree with the subtrees at split_depth spread over workers.
+
+    ``workers`` defaults to the number of CPUs; 1 runs every shard in this
+    process. Node lists are not collected. ``summary.table`` holds the
+    counters of the table that merges symmetric shards plus the number of
+    shards. A celtic.stats.Stats times the whole run as phase 'enumerate';
+    cProfile only sees this process.
+    """
+    if board is not None:
+        size = board.size
+    if max_depth is not None and max_depth <= split_depth:
+        return enumerate_tree(board, size, max_depth=max_depth, stats=stats)
+    if stats is None:
+        return _parallel_enumerate(board, size, split_depth, workers, max_depth)[0]
+    with stats.phase('enumerate'):
+        summary, shards = _parallel_enumerate(board, size, split_depth, workers, max_depth)
+    summary.record_stats(stats)
+    stats.add('shards', shards)
+    return summary
+
+
+def _parallel_enumerate(board, size, split_depth, workers, max_depth):
+    # Count the positions above the split here and leave the rest to workers
+    summary = enumerate_tree(board, size, max_depth=split_depth, keep_nodes=True)
+    summary.truncated = 0
+    split = TranspositionTable()
+    shards = {}
+    for node in summary.node_list:
+        # Every position at the split depth was left unexpanded
+        if node.depth == split_depth:
+            key = split.key(engine.Board.from_key(node.key, size))
+            shard = split.get(key)
+            if shard is None:
+                shard = shards[key] = [node.key, 0]
+                split.put(key, shard)
+            shard[1] += 1
+    summary.node_list = None
+
+    shard_depth = None if max_depth is None else max_depth - split_depth
+    tasks = [(key, size, shard_depth) for key, _ in shards.values()]
+    for (_, count), shard in zip(shards.values(), _run(_enumerate_shard, tasks, workers)):
+        summary.merge(shard, split_depth, count)
+    summary.table = dict(split.summary(), shards=len(tasks))
+    return summary, len(tasks)
+
+
+def _summarize_shard(task):
+    key, size, max_entries = task
+    table = TranspositionTable(max_entries)
+    return summarize_subtree(engine.Board.from_key(key, size), table), table.summary()
+
+
+def parallel_summarize(board=None, size=engine.DEFAULT_SIZE, split_depth=1, workers=None,
+                       max_entries=DEFAULT_MAX_ENTRIES):
+    """summarize_subtree with the subtrees at split_depth spread over workers.
+
+    Shards that are symmetric images of each other are solved once and
+    weighted by how often they occur. Each worker uses its own
+    transposition table of ``max_entries``; their counters are summed in
+    the returned table summary.
+
+    Returns (SubtreeSummary, table_summary), the summary's outcomes
+    counting the leaves above the split and in every shard.
+    """
+    if board is None:
+        board = engine.Board.initial(size)
+    split = TranspositionTable()
+
+    nodes = leaves = depth = 0
+    outcomes = dict.fromkeys(engine.OUTCOMES, 0)
+    shards = {}
+    for path, position, children in iter_tree(board, max_depth=split_depth):
+        if path:
+            nodes += 1
+        if children == 0:
+            leaves += 1
+            depth = max(depth, len(path))
+            outcomes[position.leaf_outcome()] += 1
+        elif children is None:
+            key = split.key(position)
+            if key in shards:
+                shards[key][1] += 1
+            else:
+                shards[key] = [position.key, 1]
+
+    tasks = [(key, board.size, max_entries) for key, _ in shards.values()]
+    table_summary = dict.fromkeys(TABLE_COUNTERS, 0)
+    table_summary['shards'] = len(tasks)
+    for (_, count), (shard, counters) in zip(shards.values(), _run(_summarize_shard, tasks, workers)):
+        nodes += count * shard.nodes
+        leaves += count * shard.leaves
+        depth = max(depth, split_depth + shard.depth)
+        for outcome, value in zip(engine.OUTCOMES, shard.outcomes):
+            outcomes[outcome] += count * value
+        for name, value in counters.items():
+            table_summary[name] += value
+    return SubtreeSummary(nodes, leaves, depth, tuple(outcomes.values())), table_summary
@@ -0,0 +1,211 @@
+"""Perft-style move-generation benchmark and correctness check.
+
+perft counts the positions at each depth below a start position. The
+counts depend only on the rules, so every move generator must reproduce
+the golden counts below; the benchmark reports nodes per second for each.
+
+The ``legacy`` generator is the original list-of-lists implementation of
+CelticGame.find_open_edges and can_place_tile, generalised to NxN and with
+open cells de-duplicated as the engine has done since the incremental
+frontier. Run the suite with::
+
+    python -m celtic.perft --size 3 --size 5 --depth 5
+"""
+import argparse
+import sys
+import time
+
+from celtic import engine
+
+# GOLDEN[size][depth] is the number of positions exactly depth moves after
+# the initial position
+GOLDEN = {
+    3: (1, 12, 124, 1000, 5592, 17880, 31120, 25200, 5040),
+    5: (1, 12, 132, 1216, 8952, 51888, 265264),
+    7: (1, 12, 132, 1216, 8968, 52584, 281464),
+    9: (1, 12, 132, 1216, 8968, 52584, 281496),
+}
+
+
+class LegacyBoard:
+    """Board as nested lists of rotated edge lists, like the original CelticGame"""
+
+    EDGES = {
+        'center': [True, True, True, True],
+        'blue1': [False, False, True, True],
+        'blue2': [False, False, True, False],
+        'red1': [False, False, True, True],
+        'red2': [False, False, True, False],
+    }
+
+    def __init__(self, size=engine.DEFAULT_SIZE):
+        self.size = size
+        self.tiles = [[None for _ in range(size)] for _ in range(size)]
+        self.current_player = 'blue'
+        center = size // 2
+        self.tiles[center][center] = self.EDGES['center']
+
+    @staticmethod
+    def rotated(edges, rotation):
+        rotation_steps = rotation // 90
+        return edges[-rotation_steps:] + edges[:-rotation_steps]
+
+    def find_open_edges(self):
+        last = self.size - 1
+        tiles = self.tiles
+        open_positions = []
+        for i in range(self.size):
+            for j in range(self.size):
+                edges = tiles[i][j]
+                if edges:
+                    if i > 0 and edges[0] and not tiles[i-1][j]:
+                        open_positions.append((i-1, j))
+                    if j < last and edges[1] and not tiles[i][j+1]:
+                        open_positions.append((i, j+1))
+                    if i < last and edges[2] and not tiles[i+1][j]:
+                        open_positions.append((i+1, j))
+                    if j > 0 and edges[3] and not tiles[i][j-1]:
+                        open_positions.append((i, j-1))
+        return open_positions
+
+    def can_place_tile(self, x, y, edges):
+        last = self.size - 1
+        tiles = self.tiles
+        if tiles[x][y]:
+            return False
+        if x == 0 and edges[0] or x == last and edges[2]:
+            return False
+        if y == 0 and edges[3] or y == last and edges[1]:
+            return False
+        if x > 0 and tiles[x-1][y] and edges[0] != tiles[x-1][y][2]:
+            return False
+        if y < last and tiles[x][y+1] and edges[1] != tiles[x][y+1][3]:
+            return False
+        if x < last and tiles[x+1][y] and edges[2] != tiles[x+1][y][0]:
+            return False
+        if y > 0 and tiles[x][y-1] and edges[3] != tiles[x][y-1][1]:
+            return False
+        return True
+
+    def legal_moves(self):
+        names = ['blue1', 'blue2'] if self.current_player == 'blue' else ['red1', 'red2']
+        moves = []
+        seen = set()
+        for x, y in self.find_open_edges():
+            if (x, y) in seen:
+                continue
+            seen.add((x, y))
+            distinct = []
+            for tile_type in names:
+                for rotation in [0, 90, 180, 270]:
+                    edges = self.rotated(self.EDGES[tile_type], rotation)
+                    if edges in distinct or not self.can_place_tile(x, y, edges):
+                        continue
+                    distinct.append(edges)
+                    moves.append((x, y, edges))
+        return moves
+
+    def place(self, move):
+        x, y, edges = move
+        self.tiles[x][y] = edges
+        self.current_player = 'red' if self.current_player == 'blue' else 'blue'
+
+    def remove(self, move):
+        x, y, _ = move
+        self.tiles[x][y] = None
+        self.current_player = 'red' if self.current_player == 'blue' else 'blue'
+
+
+def _perft_engine(board, depth, counts, ply=1):
+    moves = board.legal_moves()
+    counts[ply] += len(moves)
+    if ply == depth:
+        return
+    for move in moves:
+        board.place(*move)
+        _perft_engine(board, depth, counts, ply + 1)
+        board.remove(move[0])
+
+
+def _perft_legacy(board, depth, counts, ply=1):
+    moves = board.legal_moves()
+    counts[ply] += len(moves)
+    if ply == depth:
+        return
+    for move in moves:
+        board.place(move)
+        _perft_legacy(board, depth, counts, ply + 1)
+        board.remove(move)
+
+
+GENERATORS = {
+    'engine': (engine.Board.initial, _perft_engine),
+    'legacy': (LegacyBoard, _perft_legacy),
+}
+
+
+def perft(size=engine.DEFAULT_SIZE, depth=4, generator='engine'):
+    """Positions at each depth 0..depth from the initial position"""
+    make_board, walk = GENERATORS[generator]
+    counts = [1] + [0] * depth
+    if depth:
+        walk(make_board(size), depth, counts)
+    return counts
+
+
+def benchmark(size=engine.DEFAULT_SIZE, depth=4, generator='engine'):
+    """Run perft and report counts, time and nodes per second"""
+    start = time.perf_counter()
+    counts = perft(size, depth, generator)
+    seconds = time.perf_counter() - start
+    nodes = sum(counts)
+    return {
+        'generator': generator,
+        'size': size,
+        'depth': depth,
+        'counts': counts,
+        'nodes': nodes,
+        'seconds': seconds,
+        'nodes_per_second': nodes / seconds if seconds else float('inf'),
+    }
+
+
+def check(result):
+    """Compare a benchmark result with the golden counts.
+
+    Returns a list of (depth, expected, actual) mismatches; depths without
+    a golden count are not checked.
+    """
+    golden = GOLDEN.get(result['size'], ())
+    return [
+        (depth, golden[depth], actual)
+        for depth, actual in enumerate(result['counts'])
+        if depth < len(golden) and golden[depth] != actual
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m celtic.perft')
+    parser.add_argument('--size', type=int, action='append',
+                        help='board size, may be repeated (default: every golden size)')
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--generator', action='append', choices=sorted(GENERATORS),
+                        help='move generator, may be repeated (default: all)')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for size in args.size or sorted(GOLDEN):
+        for generator in args.generator or sorted(GENERATORS):
+            result = benchmark(size, args.depth, generator)
+            mismatches = check(result)
+            failed = failed or bool(mismatches)
+            status = 'FAIL' if mismatches else 'ok'
+            print(f"{size}x{size} {generator:>6} depth {args.depth}: {result['nodes']} nodes "
+                  f"in {result['seconds']:.3f}s ({result['nodes_per_second']:.0f}/s) {status}")
+            for depth, expected, actual in mismatches:
+                print(f"    depth {depth}: expected {expected}, got {actual}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
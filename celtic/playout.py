@@ -0,0 +1,40 @@
+"""Random playouts with the same policy as CelticGame.build_from_edges."""
+import random
+
+# Reward for the player who made the last move, per finished-game outcome
+_LOSER = {'blue_blocked': 'blue', 'red_blocked': 'red'}
+
+
+def random_move(board, rng=random):
+    """Fill a random open cell with the first tile that fits there.
+
+    Cells where nothing fits are dropped and another is drawn, so the
+    result is None only when the player to move has no legal move.
+    """
+    cells = board.frontier_cells()
+    while cells:
+        index = rng.randrange(len(cells))
+        cell = cells[index]
+        placement = board.first_fit(cell)
+        if placement is not None:
+            return (cell,) + placement
+        cells[index] = cells[-1]
+        cells.pop()
+    return None
+
+
+def random_playout(board, rng=random):
+    """Play random moves on board until the game ends and return the outcome"""
+    while True:
+        move = random_move(board, rng)
+        if move is None:
+            return board.leaf_outcome()
+        board.place(*move)
+
+
+def reward(outcome, player):
+    """1 for a win, 0 for a loss and 0.5 for a closed knot, from player's view"""
+    loser = _LOSER.get(outcome)
+    if loser is None:
+        return 0.5
+    return 0.0 if loser == player else 1.0
@@ -0,0 +1,219 @@
+"""Memory-mapped database of solved positions.
+
+The file is a fixed header followed by fixed-size records sorted by
+canonical position key, so lookups are a binary search over the mapped
+file and several processes can share one database without loading it.
+
+Header (little endian): magic, format version, board size, key bytes,
+record size, record count. Each record holds the canonical key
+(big endian, so byte order matches numeric order), the solved value for
+the player to move, the best move in the canonical frame and the number
+of positions in the full tree below the position.
+
+Build a database ahead of time with::
+
+    python -m celtic.positiondb build --size 3 celtic3.db
+"""
+import argparse
+import mmap
+import struct
+import sys
+from collections import namedtuple
+
+from celtic import engine, symmetry
+from celtic.engine import CELL_BITS
+from celtic.solver import WIN
+
+MAGIC = b'CELTPDB\0'
+VERSION = 1
+
+HEADER = struct.Struct('<8sHBBHxxQ')
+RECORD = struct.Struct('<hHQ')
+
+NO_MOVE = 0xFFFF
+MAX_SUBTREE = (1 << 64) - 1
+
+# value is from the point of view of the player to move (see celtic.solver)
+PositionEntry = namedtuple('PositionEntry', 'value move subtree')
+
+
+def key_bytes(size):
+    return (size * size * CELL_BITS + 7) // 8
+
+
+def _pack_move(move):
+    return NO_MOVE if move is None else engine.pack_move(move)
+
+
+def _unpack_move(packed):
+    return None if packed == NO_MOVE else engine.unpack_move(packed)
+
+
+def solve_positions(board=None, size=engine.DEFAULT_SIZE):
+    """Solve every position below board exactly.
+
+    Returns {canonical_key: PositionEntry} with moves in the canonical frame.
+    """
+    if board is None:
+        board = engine.Board.initial(size)
+    else:
+        board = board.copy()
+    solved = {}
+    _solve(board, solved)
+    return solved
+
+
+def _solve(board, solved):
+    key, transform = symmetry.canonical_form(board.key, board.size)
+    entry = solved.get(key)
+    if entry is not None:
+        return entry
+
+    moves = board.legal_moves()
+    if not moves:
+        entry = PositionEntry(0 if not board.frontier else -WIN, None, 0)
+    else:
+        best_value = -WIN - 1
+        best_move = None
+        subtree = 0
+        for move in moves:
+            board.place(*move)
+            child = _solve(board, solved)
+            board.remove(move[0])
+            subtree += 1 + child.subtree
+            if -child.value > best_value:
+                best_value = -child.value
+                best_move = move
+        entry = PositionEntry(best_value, symmetry.transform_move(best_move, transform),
+                              min(subtree, MAX_SUBTREE))
+    solved[key] = entry
+    return entry
+
+
+def write_database(path, solved, size):
+    """Write {canonical_key: PositionEntry} to path in sorted order"""
+    width = key_bytes(size)
+    with open(path, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, size, width, width + RECORD.size, len(solved)))
+        for key in sorted(solved):
+            value, move, subtree = solved[key]
+            handle.write(key.to_bytes(width, 'big'))
+            handle.write(RECORD.pack(value, _pack_move(move), subtree))
+
+
+def build_database(path, size=engine.DEFAULT_SIZE):
+    """Solve the whole game for a board size and write it to path"""
+    solved = solve_positions(size=size)
+    write_database(path, solved, size)
+    return len(solved)
+
+
+class PositionDatabase:
+    """Read-only view of a database file through mmap"""
+
+    def __init__(self, path):
+        self._handle = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._handle.close()
+            raise ValueError(f"{path} is empty, not a position database")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a position database")
+        magic, version, size, width, record_size, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a position database")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path} has format version {version}, expected {VERSION}")
+        if record_size != width + RECORD.size:
+            self.close()
+            raise ValueError(f"{path} has {record_size}-byte records, expected {width + RECORD.size}")
+        length = len(self._map)
+        if length != HEADER.size + count * record_size:
+            self.close()
+            raise ValueError(f"{path} is {length} bytes, expected "
+                             f"{HEADER.size + count * record_size} for {count} records")
+        self.size = size
+        self.count = count
+        self._width = width
+        self._record_size = record_size
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._handle.close()
+
+    def _find(self, key):
+        target = key.to_bytes(self._width, 'big')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * self._record_size
+            probe = self._map[offset:offset + self._width]
+            if probe < target:
+                low = middle + 1
+            elif probe > target:
+                high = middle
+            else:
+                value, move, subtree = RECORD.unpack_from(self._map, offset + self._width)
+                return PositionEntry(value, _unpack_move(move), subtree)
+        return None
+
+    def get_canonical(self, key):
+        """Entry for a canonical key, with the move in the canonical frame"""
+        return self._find(key)
+
+    def get(self, board):
+        """Entry for board with the best move mapped into board's frame, or None"""
+        if board.size != self.size:
+            return None
+        key, transform = symmetry.canonical_form(board.key, board.size)
+        entry = self._find(key)
+        if entry is None or entry.move is None:
+            return entry
+        return entry._replace(move=symmetry.untransform_move(entry.move, transform))
+
+    def value(self, board):
+        """Solved value of board for the player to move, or None"""
+        if board.size != self.size:
+            return None
+        entry = self._find(symmetry.canonical_key(board.key, board.size))
+        return None if entry is None else entry.value
+
+    def __contains__(self, board):
+        return self.get(board) is not None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m celtic.positiondb')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='solve a board size and write the database')
+    build.add_argument('path')
+    build.add_argument('--size', type=int, default=engine.DEFAULT_SIZE)
+    info = commands.add_parser('info', help='print the header of a database')
+    info.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build_database(args.path, args.size)
+        print(f"Wrote {count} positions for {args.size}x{args.size} to {args.path}")
+    else:
+        with PositionDatabase(args.path) as database:
+            print(f"{args.path}: version {VERSION}, {database.size}x{database.size}, "
+                  f"{len(database)} positions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""Compact binary game records.
+
+A record file is a header followed by games back to back, so files can be
+appended to and streamed. All integers are little endian.
+
+Header: magic, format version, board size. Each game is a 16-bit move
+count followed by that many 16-bit moves packed as
+``cell << 5 | tile << 2 | rotation_steps`` (engine.pack_move). Games start
+from the initial position, so the center tile is not stored; the outcome
+is not stored either, replay recomputes it.
+
+Record games with ``python -m celtic simulate --record games.rec`` and
+inspect them with::
+
+    python -m celtic.records info games.rec
+    python -m celtic.records verify games.rec
+    python -m celtic.records render games.rec --game 12 game12.png
+"""
+import argparse
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+from celtic import engine
+
+MAGIC = b'CELTREC\0'
+VERSION = 1
+
+HEADER = struct.Struct('<8sHBx')
+
+# pack_move keeps the cell index in 11 bits, which also keeps the size in
+# the header's single byte
+MAX_CELLS = 1 << 11
+
+# Games are written out once this many moves are buffered
+FLUSH_MOVES = 1 << 16
+
+# games and moves read, outcomes of the games that replayed cleanly and
+# (game index, message) for the ones that did not
+VerifyResult = namedtuple('VerifyResult', 'games moves outcomes errors')
+
+
+def _read_header(handle, path):
+    """Board size from a record file header, checking magic and version"""
+    header = handle.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a game record file")
+    magic, version, size = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a game record file")
+    if version != VERSION:
+        raise ValueError(f"{path} has format version {version}, expected {VERSION}")
+    return size
+
+
+def _words(values):
+    words = array('H', values)
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words
+
+
+class RecordWriter:
+    """Append games of one board size to a record file.
+
+    Opening an existing file with ``append`` checks that its header matches
+    and adds games at the end. Boards of more than MAX_CELLS cells do not
+    fit the packed move format.
+    """
+
+    def __init__(self, path, size=engine.DEFAULT_SIZE, append=False):
+        if engine.geometry(size).cells > MAX_CELLS:
+            raise ValueError(f"Game records hold boards of at most {MAX_CELLS} cells, "
+                             f"got {size}x{size}")
+        self.path = path
+        self.size = size
+        self.games = 0
+        self._buffer = []
+        if append:
+            try:
+                with open(path, 'rb') as handle:
+                    existing = _read_header(handle, path)
+            except FileNotFoundError:
+                append = False
+            else:
+                if existing != size:
+                    raise ValueError(
+                        f"{path} holds {existing}x{existing} games, not {size}x{size}")
+        self._handle = open(path, 'ab' if append else 'wb')
+        if not append:
+            self._handle.write(HEADER.pack(MAGIC, VERSION, size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, moves):
+        """Add one game given as (cell, tile, rotation) moves after the center tile"""
+        buffer = self._buffer
+        buffer.append(len(moves))
+        buffer.extend(engine.pack_move(move) for move in moves)
+        self.games += 1
+        if len(buffer) >= FLUSH_MOVES:
+            self.flush()
+
+    def write_many(self, games):
+        for moves in games:
+            self.write(moves)
+
+    def write_packed(self, moves, lengths):
+        """Add a batch of games from a (games, width) array of packed moves.
+
+        Row i holds game i's moves in its first lengths[i] columns, the
+        layout celtic.simulate produces.
+        """
+        import numpy as np
+
+        self.flush()
+        table = np.zeros((len(lengths), moves.shape[1] + 1), dtype='<u2')
+        table[:, 0] = lengths
+        table[:, 1:] = moves
+        keep = np.arange(table.shape[1]) <= np.asarray(lengths)[:, None]
+        self._handle.write(table[keep].tobytes())
+        self.games += len(lengths)
+
+    def flush(self):
+        if self._buffer:
+            _words(self._buffer).tofile(self._handle)
+            self._buffer = []
+        self._handle.flush()
+
+    def close(self):
+        if not self._handle.closed:
+            self.flush()
+            self._handle.close()
+
+
+class RecordReader:
+    """Read the games of a record file.
+
+    The whole file is loaded as one array of 16-bit words; iterating yields
+    each game as a tuple of (cell, tile, rotation) moves. Indexing builds
+    an offset table on first use, so any game can be fetched directly.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as handle:
+            size = _read_header(handle, path)
+            data = handle.read()
+        if len(data) % 2:
+            raise ValueError(f"{path} is truncated")
+        self.path = path
+        self.size = size
+        self._words = array('H')
+        self._words.frombytes(data)
+        if sys.byteorder == 'big':
+            self._words.byteswap()
+        self._offsets = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def iter_packed(self):
+        """Yield each game as a slice of packed moves"""
+        words = self._words
+        position = 0
+        end = len(words)
+        while position < end:
+            count = words[position]
+            start = position + 1
+            position = start + count
+            if position > end:
+                raise ValueError(f"{self.path} is truncated")
+            yield words[start:position]
+
+    def __iter__(self):
+        unpack = engine.unpack_move
+        for packed in self.iter_packed():
+            yield tuple(unpack(move) for move in packed)
+
+    def _index(self):
+        if self._offsets is None:
+            offsets = array('Q')
+            words = self._words
+            position = 0
+            while position < len(words):
+                offsets.append(position)
+                position += 1 + words[position]
+            self._offsets = offsets
+        return self._offsets
+
+    def __len__(self):
+        return len(self._index())
+
+    def __getitem__(self, index):
+        start = self._index()[index]
+        count = self._words[start]
+        return tuple(engine.unpack_move(move) for move in self._words[start + 1:start + 1 + count])
+
+
+def replay(moves, size=engine.DEFAULT_SIZE, verify=True):
+    """Board after playing moves from the initial position.
+
+    With ``verify`` every move must be legal for the player to move, and a
+    ValueError names the first one that is not.
+    """
+    board = engine.Board.initial(size)
+    for ply, move in enumerate(moves):
+        cell, tile, rotation = move
+        if verify and (tile not in engine.PLAYER_TILES[board.player]
+                       or cell >= board.geometry.cells
+                       or not board.can_place(cell, tile, rotation)):
+            raise ValueError(f"Move {ply} {move} is not legal for {board.player}")
+        board.place(cell, tile, rotation)
+    return board
+
+
+def positions(moves, size=engine.DEFAULT_SIZE):
+    """Yield the position key after each move, starting with the initial position"""
+    board = engine.Board.initial(size)
+    yield board.key
+    for move in moves:
+        board.place(*move)
+        yield board.key
+
+
+def verify(path):
+    """Replay every game of a record file and tally the final outcomes.
+
+    A game is valid when every move is legal and the game ends in a
+    position where the player to move is stuck or no open edge is left.
+    """
+    outcomes = dict.fromkeys(engine.OUTCOMES, 0)
+    errors = []
+    games = moves = 0
+    with RecordReader(path) as reader:
+        for index, game in enumerate(reader):
+            games += 1
+            moves += len(game)
+            try:
+                board = replay(game, reader.size)
+            except ValueError as error:
+                errors.append((index, str(error)))
+                continue
+            outcome = board.outcome()
+            if outcome is None:
+                errors.append((index, "game stops while the player to move has a move"))
+                continue
+            outcomes[outcome] += 1
+    return VerifyResult(games, moves, outcomes, errors)
+
+
+def render_game(output_path, moves, size=engine.DEFAULT_SIZE, tile_size=60, ply=None,
+                base_path=None):
+    """Save a PNG of a recorded game.
+
+    With ``ply`` only the position after that many moves is drawn,
+    otherwise every position of the game side by side.
+    """
+    import numpy as np
+    import matplotlib.image
+
+    from celtic import images
+    from celtic.render import get_array_renderer
+
+    renderer = get_array_renderer(size, tile_size, base_path or images.BASE_PATH)
+    keys = list(positions(moves, size))
+    if ply is not None:
+        keys = [keys[ply]]
+    frames = [renderer.render_key(key).copy() for key in keys]
+    matplotlib.image.imsave(output_path, np.concatenate(frames, axis=1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m celtic.records')
+    commands = parser.add_subparsers(dest='command', required=True)
+    info = commands.add_parser('info', help='print the board size and game count')
+    info.add_argument('path')
+    check = commands.add_parser('verify', help='replay every game and tally the outcomes')
+    check.add_argument('path')
+    render = commands.add_parser('render', help='draw one game as a PNG')
+    render.add_argument('path')
+    render.add_argument('output')
+    render.add_argument('--game', type=int, default=0, help='game index (default: 0)')
+    render.add_argument('--ply', type=int, help='only draw the position after this many moves')
+    render.add_argument('--tile-size', type=int, default=60)
+    args = parser.parse_args(argv)
+
+    if args.command == 'info':
+        with RecordReader(args.path) as reader:
+            print(f"{args.path}: version {VERSION}, {reader.size}x{reader.size}, "
+                  f"{len(reader)} games")
+        return 0
+    if args.command == 'verify':
+        result = verify(args.path)
+        outcomes = ', '.join(f"{name} {count}" for name, count in result.outcomes.items())
+        print(f"{result.games} games, {result.moves} moves: {outcomes}")
+        for index, message in result.errors[:20]:
+            print(f"    game {index}: {message}")
+        if len(result.errors) > 20:
+            print(f"    ... {len(result.errors) - 20} more")
+        return 1 if result.errors else 0
+    with RecordReader(args.path) as reader:
+        count = len(reader)
+        if not 0 <= args.game < count:
+            parser.error(f"--game must be between 0 and {count - 1}, got {args.game}")
+        moves = reader[args.game]
+        if args.ply is not None and not 0 <= args.ply <= len(moves):
+            parser.error(f"game {args.game} has {len(moves)} moves, "
+                         f"--ply must be between 0 and {len(moves)}, got {args.ply}")
+        render_game(args.output, moves, reader.size, args.tile_size, args.ply)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""Board rendering with cached sprites and composed boards.
+
+Tile sprites come pre-resized and pre-rotated from the shared tile image
+cache. Composed boards are cached per (board size, position key,
+tile_size), and a child position is drawn by pasting its new tiles onto a
+copy of its parent's image.
+
+ArrayRenderer is the NumPy path: boards are composed by slice assignment
+from a sprite atlas into one preallocated uint8 buffer.
+"""
+
+import numpy as np
+
+from celtic import engine, images
+from celtic.engine import CELL_BITS, CELL_MASK
+from celtic.lru import LRUCache
+
+# Composed board images kept per renderer
+MAX_BOARDS = 512
+
+
+def _extends(key, parent_key):
+    """Whether every occupied cell of parent_key holds the same code in key"""
+    while parent_key:
+        code = parent_key & CELL_MASK
+        if code and code != key & CELL_MASK:
+            return False
+        parent_key >>= CELL_BITS
+        key >>= CELL_BITS
+    return True
+
+
+def _codes(key):
+    """Yield (cell, code) for every occupied cell of a packed key"""
+    cell = 0
+    while key:
+        code = key & CELL_MASK
+        if code:
+            yield cell, code
+        key >>= CELL_BITS
+        cell += 1
+
+
+class BoardRenderer:
+    """Compose board images from cached tile sprites.
+
+    Returned images are shared with the cache and must not be modified;
+    copy them first if needed.
+    """
+
+    def __init__(self, base_path=images.BASE_PATH, max_boards=MAX_BOARDS):
+        self.sprites = images.get_cache(base_path)
+        self.max_boards = max_boards
+        self.incremental = 0
+        self._blanks = {}
+        self._boards = LRUCache(max_boards)
+
+    @property
+    def hits(self):
+        return self._boards.hits
+
+    @property
+    def misses(self):
+        return self._boards.misses
+
+    def blank(self, size, tile_size):
+        """Empty grid of light gray cells"""
+        image = self._blanks.get((size, tile_size))
+        if image is None:
+            from PIL import Image, ImageDraw
+
+            img_size = tile_size * size
+            image = Image.new('RGB', (img_size, img_size), 'white')
+            draw = ImageDraw.Draw(image)
+            for i in range(1, size):
+                draw.line([(i * tile_size, 0), (i * tile_size, img_size)], fill='black', width=2)
+                draw.line([(0, i * tile_size), (img_size, i * tile_size)], fill='black', width=2)
+            for i in range(size):
+                for j in range(size):
+                    draw.rectangle([j * tile_size, i * tile_size,
+                                    (j + 1) * tile_size, (i + 1) * tile_size],
+                                   fill='lightgray')
+            self._blanks[(size, tile_size)] = image
+        return image
+
+    def _paste(self, image, size, key, tile_size):
+        for cell, code in _codes(key):
+            x, y = divmod(cell, size)
+            sprite = self.sprites.get(
+                engine.TILE_TYPES[(code - 1) >> 2], tile_size, ((code - 1) & 3) * 90)
+            image.paste(sprite, (y * tile_size, x * tile_size))
+
+    def render_key(self, size, key, tile_size=100, parent_key=None):
+        """Image of the packed position key on a size x size board.
+
+        When ``parent_key`` is a position that ``key`` extends, the parent
+        is rendered (or taken from the cache) first and only the new tiles
+        are pasted onto a copy of it.
+        """
+        cache_key = (size, key, tile_size)
+        image = self._boards.get(cache_key)
+        if image is not None:
+            return image
+
+        if parent_key is not None and _extends(key, parent_key):
+            image = self.render_key(size, parent_key, tile_size).copy()
+            self._paste(image, size, key ^ parent_key, tile_size)
+            self.incremental += 1
+        else:
+            image = self.blank(size, tile_size).copy()
+            self._paste(image, size, key, tile_size)
+        self._boards.put(cache_key, image)
+        return image
+
+    def render(self, board, tile_size=100, parent=None):
+        """Image of an engine Board, drawn on top of parent when given"""
+        parent_key = parent.key if parent is not None else None
+        return self.render_key(board.size, board.key, tile_size, parent_key)
+
+    def clear(self):
+        self._blanks.clear()
+        self._boards.clear()
+        self.incremental = 0
+
+
+class ArrayRenderer:
+    """Compose boards of one size and tile_size into a reusable uint8 buffer.
+
+    ``atlas[code]`` is the RGB sprite for a packed cell code. Only cells
+    whose code differs from the position currently in the buffer are
+    redrawn, so walking a tree depth first touches one or two cells per
+    node. render_key returns the buffer itself: it is overwritten by the
+    next call, so copy it if the image has to outlive that.
+    """
+
+    def __init__(self, size, tile_size=100, base_path=images.BASE_PATH):
+        self.size = size
+        self.tile_size = tile_size
+        self.renderer = get_renderer(base_path)
+
+        blank = self.renderer.blank(size, tile_size)
+        self.blank = np.asarray(blank, dtype=np.uint8)
+        self.atlas = np.zeros((CELL_MASK + 1, tile_size, tile_size, 3), dtype=np.uint8)
+        for tile, name in enumerate(engine.TILE_TYPES):
+            for steps in range(4):
+                sprite = self.renderer.sprites.get(name, tile_size, steps * 90)
+                self.atlas[1 + (tile << 2) + steps] = np.asarray(sprite.convert('RGB'))
+
+        self.buffer = self.blank.copy()
+        self._codes = [0] * (size * size)
+
+    def _cell_view(self, array, cell):
+        x, y = divmod(cell, self.size)
+        tile_size = self.tile_size
+        return array[x * tile_size:(x + 1) * tile_size, y * tile_size:(y + 1) * tile_size]
+
+    def render_key(self, key):
+        """Draw the packed position key into the buffer and return it"""
+        codes = self._codes
+        buffer = self.buffer
+        for cell in range(self.size * self.size):
+            code = (key >> (cell * CELL_BITS)) & CELL_MASK
+            if code != codes[cell]:
+                view = self._cell_view(buffer, cell)
+                view[...] = self.atlas[code] if code else self._cell_view(self.blank, cell)
+                codes[cell] = code
+        return buffer
+
+    def render(self, board):
+        return self.render_key(board.key)
+
+    def save(self, path, board):
+        """Write the board straight from the buffer with matplotlib's image writer"""
+        import matplotlib.image
+
+        matplotlib.image.imsave(path, self.render(board))
+
+
+_renderers = {}
+_array_renderers = {}
+
+
+def get_renderer(base_path=images.BASE_PATH):
+    """Shared renderer for an image directory"""
+    renderer = _renderers.get(base_path)
+    if renderer is None:
+        renderer = _renderers[base_path] = BoardRenderer(base_path)
+    return renderer
+
+
+def get_array_renderer(size, tile_size=100, base_path=images.BASE_PATH):
+    """Shared ArrayRenderer for a board size and tile_size"""
+    key = (size, tile_size, base_path)
+    renderer = _array_renderers.get(key)
+    if renderer is None:
+        renderer = _array_renderers[key] = ArrayRenderer(size, tile_size, base_path)
+    return renderer
@@ -0,0 +1,181 @@
+"""Batch self-play with vectorised NumPy playouts.
+
+Every game in a batch follows the build_from_edges policy: fill a random
+open cell that some tile fits, with the first tile and rotation that fits
+there. Games advance in lockstep, so all of them have the same player to
+move at each step and each legality check covers the whole batch at once.
+"""
+import numpy as np
+
+from celtic import engine
+
+DEFAULT_BATCH_SIZE = 1 << 15
+
+
+class SimulationSummary:
+    """Aggregate outcomes of a batch of simulated games.
+
+    ``openings`` maps each first blue move (cell, tile, rotation) to its
+    game count, outcome counts and ``dead_ends``: games in which some open
+    cell could not be filled by the player to move at some point, the
+    situation build_from_edges reports as "Could not place tile".
+    """
+
+    def __init__(self, size, seed):
+        self.size = size
+        self.seed = seed
+        self.games = 0
+        self.moves = 0
+        self.outcomes = dict.fromkeys(engine.OUTCOMES, 0)
+        self.dead_ends = 0
+        self.openings = {}
+
+    @property
+    def mean_length(self):
+        return self.moves / self.games if self.games else 0.0
+
+    def as_dict(self):
+        return {
+            'size': self.size,
+            'seed': self.seed,
+            'games': self.games,
+            'mean_length': self.mean_length,
+            'outcomes': dict(self.outcomes),
+            'dead_ends': self.dead_ends,
+            'openings': {
+                f"{cell}:{engine.TILE_TYPES[tile]}:{rotation}": dict(counts)
+                for (cell, tile, rotation), counts in sorted(self.openings.items())
+            },
+        }
+
+    def __repr__(self):
+        return f"SimulationSummary(games={self.games}, outcomes={self.outcomes})"
+
+
+def _constraints(edges, occupied):
+    """Per-cell masks of required open edges and of edges that are fixed.
+
+    An edge is fixed when it faces the border (it must be closed) or an
+    occupied neighbour (it must match that neighbour's facing edge).
+    """
+    required = np.zeros_like(edges)
+    fixed = np.zeros_like(edges)
+
+    # Top edge (bit 0) meets the bottom edge (bit 2) of the cell above
+    required[:, 1:, :] |= (edges[:, :-1, :] >> 2) & 1
+    fixed[:, 1:, :] |= occupied[:, :-1, :]
+    fixed[:, 0, :] |= 1
+    # Right edge (bit 1) meets the left edge (bit 3) of the cell to the right
+    required[:, :, :-1] |= ((edges[:, :, 1:] >> 3) & 1) << 1
+    fixed[:, :, :-1] |= occupied[:, :, 1:] << 1
+    fixed[:, :, -1] |= 2
+    # Bottom edge (bit 2) meets the top edge (bit 0) of the cell below
+    required[:, :-1, :] |= (edges[:, 1:, :] & 1) << 2
+    fixed[:, :-1, :] |= occupied[:, 1:, :] << 2
+    fixed[:, -1, :] |= 4
+    # Left edge (bit 3) meets the right edge (bit 1) of the cell to the left
+    required[:, :, 1:] |= ((edges[:, :, :-1] >> 1) & 1) << 3
+    fixed[:, :, 1:] |= occupied[:, :, :-1] << 3
+    fixed[:, :, 0] |= 8
+    return required, fixed
+
+
+def _simulate_batch(games, size, rng, summary, recorder=None):
+    cells = size * size
+    center = size // 2
+    edges = np.zeros((games, size, size), dtype=np.uint8)
+    occupied = np.zeros((games, size, size), dtype=np.uint8)
+    edges[:, center, center] = engine.EDGE_TABLE[engine.TILE_INDEX['center']][0]
+    occupied[:, center, center] = 1
+
+    flat_edges = edges.reshape(games, cells)
+    flat_occupied = occupied.reshape(games, cells)
+    alive = np.ones(games, dtype=bool)
+    dead_end = np.zeros(games, dtype=bool)
+    opening = np.zeros(games, dtype=np.int64)
+    outcome = np.zeros(games, dtype=np.int8)
+    moves = 0
+    if recorder is not None:
+        record = np.zeros((games, cells), dtype=np.uint16)
+        lengths = np.zeros(games, dtype=np.int64)
+
+    for step in range(cells):
+        player = 'blue' if step % 2 == 0 else 'red'
+        options = engine.PLAYER_OPTIONS[player]
+        masks = np.array([mask for _, _, mask in options], dtype=np.uint8)
+        codes = np.array([(tile << 2) | (rotation // 90) for tile, rotation, _ in options])
+
+        required, fixed = _constraints(edges, occupied)
+        frontier = (required != 0) & (occupied == 0)
+        fits = ((masks ^ required[..., None]) & fixed[..., None]) == 0
+        fits &= frontier[..., None]
+        fits = fits.reshape(games, cells, len(options))
+        fillable = fits.any(axis=2)
+        open_cells = frontier.reshape(games, cells)
+
+        dead_end |= alive & (open_cells & ~fillable).any(axis=1)
+
+        # Games where nothing fits end here
+        can_move = fillable.any(axis=1)
+        finished = alive & ~can_move
+        if finished.any():
+            closed = ~open_cells.any(axis=1)
+            outcome[finished & closed] = engine.OUTCOMES.index('closed')
+            outcome[finished & ~closed] = engine.OUTCOMES.index(f'{player}_blocked')
+            alive &= can_move
+        if not alive.any():
+            break
+
+        # A uniformly random fillable cell, then its first fitting option
+        active = np.flatnonzero(alive)
+        keys = rng.random((active.size, cells))
+        keys[~fillable[active]] = -1.0
+        cell = keys.argmax(axis=1)
+        option = fits[active, cell].argmax(axis=1)
+
+        flat_edges[active, cell] = masks[option]
+        flat_occupied[active, cell] = 1
+        moves += active.size
+        if step == 0:
+            opening[active] = (cell << 5) | codes[option]
+        if recorder is not None:
+            record[active, step] = (cell << 5) | codes[option]
+            lengths[active] += 1
+
+    if recorder is not None:
+        recorder.write_packed(record, lengths)
+
+    summary.games += games
+    summary.moves += moves
+    summary.dead_ends += int(dead_end.sum())
+    for index, name in enumerate(engine.OUTCOMES):
+        summary.outcomes[name] += int((outcome == index).sum())
+
+    for code in np.unique(opening):
+        selected = opening == code
+        move = engine.unpack_move(int(code))
+        counts = summary.openings.setdefault(
+            move, dict(games=0, dead_ends=0, **dict.fromkeys(engine.OUTCOMES, 0)))
+        counts['games'] += int(selected.sum())
+        counts['dead_ends'] += int((dead_end & selected).sum())
+        for index, name in enumerate(engine.OUTCOMES):
+            counts[name] += int((outcome[selected] == index).sum())
+
+
+def simulate(games, size=engine.DEFAULT_SIZE, seed=None, batch_size=DEFAULT_BATCH_SIZE,
+             recorder=None):
+    """Play games random games and return a SimulationSummary.
+
+    Games are processed ``batch_size`` at a time to bound memory. The same
+    seed, games and batch_size always give the same summary. Pass a
+    celtic.records.RecordWriter for the board size to keep every game.
+    """
+    engine.geometry(size)
+    rng = np.random.default_rng(seed)
+    summary = SimulationSummary(size, seed)
+    remaining = games
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        _simulate_batch(batch, size, rng, summary, recorder)
+        remaining -= batch
+    return summary
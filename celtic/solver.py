@@ -0,0 +1,206 @@
+"""Alpha-beta solver for the blue-vs-red game.
+
+Values are from the point of view of the player to move. A player who
+cannot fill any open edge loses (-WIN), a closed knot with no open edges
+is a draw (0), and positions at the search horizon are scored by mobility:
+the difference between the two players' legal move counts.
+"""
+import time
+from collections import namedtuple
+
+from celtic.transposition import DEFAULT_MAX_ENTRIES, TranspositionTable
+
+WIN = 1000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# value and move of the deepest completed iteration; exact is True when
+# that iteration searched every line to the end of the game
+SearchResult = namedtuple('SearchResult', 'value move depth nodes exact')
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+class Solver:
+    """Iterative-deepening negamax with alpha-beta pruning.
+
+    Moves are ordered by the transposition table's best move, then two
+    killer moves per ply, then the history heuristic. The search stops at
+    ``max_nodes`` or after ``time_limit`` seconds and returns the last
+    completed iteration. The table and move-ordering statistics are kept
+    between calls so consecutive moves of a game reuse earlier work.
+
+    An optional celtic.positiondb.PositionDatabase supplies exact values
+    for positions solved ahead of time. An optional celtic.stats.Stats
+    times every solve call as phase 'solve' and collects node and table
+    counters.
+    """
+
+    def __init__(self, max_nodes=None, time_limit=None, max_entries=DEFAULT_MAX_ENTRIES,
+                 database=None, stats=None):
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.database = database
+        self.stats = stats
+        self.table = TranspositionTable(max_entries, symmetry=False)
+        self.history = {}
+        self.killers = []
+        self.nodes = 0
+        self._deadline = None
+        self._node_limit = None
+
+    def solve(self, board, max_depth=None):
+        """Search board and return a SearchResult; board is left unchanged"""
+        stats = self.stats
+        if stats is None:
+            return self._solve(board, max_depth)
+        before = self.table.summary()
+        with stats.phase('solve'):
+            result = self._solve(board, max_depth)
+        after = self.table.summary()
+        stats.add('nodes', self.nodes)
+        stats.add('iterations', result.depth)
+        stats.update({name: after[name] - before[name] for name in ('hits', 'misses', 'stores')},
+                     prefix='tt_')
+        return result
+
+    def _solve(self, board, max_depth):
+        board = board.copy()
+        remaining = board.geometry.cells - board.count
+        self.nodes = 0
+        if self.database is not None:
+            entry = self.database.get(board)
+            if entry is not None:
+                return SearchResult(entry.value, entry.move, remaining, 0, True)
+        # An aborted iteration leaves moves on the board, so keep the fallback now
+        fallback = board.first_k(1)
+        if not fallback:
+            return SearchResult(self._terminal(board), None, 0, 0, True)
+        if max_depth is None or max_depth > remaining:
+            max_depth = remaining
+
+        self._deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self._node_limit = self.max_nodes
+
+        result = None
+        for depth in range(1, max_depth + 1):
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                break
+            try:
+                value, move = self._root(board, depth)
+            except _OutOfBudget:
+                break
+            exact = depth == remaining or abs(value) == WIN
+            result = SearchResult(value, move, depth, self.nodes, exact)
+            if exact or move is None:
+                break
+
+        if result is None:
+            # Not even one ply fitted the budget, fall back to the first move
+            result = SearchResult(0, fallback[0], 0, self.nodes, False)
+        return result
+
+    def _root(self, board, depth):
+        value = self._search(board, depth, -WIN - 1, WIN + 1, 0)
+        entry = self.table.peek(board.key)
+        return value, entry[3] if entry else None
+
+    def _terminal(self, board):
+        # No legal moves: closed knots are draws, otherwise the mover is stuck
+        return 0 if not board.frontier else -WIN
+
+    def _evaluate(self, board, moves):
+        opponent = 'red' if board.player == 'blue' else 'blue'
+        score = len(moves) - board.count_moves(opponent)
+        return max(-WIN + 1, min(WIN - 1, score))
+
+    def _order(self, moves, tt_move, ply):
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+
+        def priority(move):
+            if move == tt_move:
+                return (2, 0)
+            if move in killers:
+                return (1, 0)
+            return (0, history.get(move, 0))
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _record_cutoff(self, move, depth, ply):
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def _search(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise _OutOfBudget
+        # Within an iteration the clock is only read every 1024 nodes
+        if (not self.nodes & 1023 and self._deadline is not None
+                and time.perf_counter() >= self._deadline):
+            raise _OutOfBudget
+
+        key = board.key
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, entry_value, flag, tt_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return entry_value
+                if flag == LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value
+
+        if self.database is not None:
+            value = self.database.value(board)
+            if value is not None:
+                return value
+
+        moves = board.legal_moves()
+        if not moves:
+            return self._terminal(board)
+        if depth == 0:
+            return self._evaluate(board, moves)
+
+        original_alpha = alpha
+        best_value = -WIN - 1
+        best_move = None
+        for move in self._order(moves, tt_move, ply):
+            board.place(*move)
+            value = -self._search(board, depth - 1, -beta, -alpha, ply + 1)
+            board.remove(move[0])
+            if value > best_value:
+                best_value = value
+                best_move = move
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                self._record_cutoff(move, depth, ply)
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(key, (depth, best_value, flag, best_move))
+        return best_value
+
+
+def best_move(state, max_nodes=None, time_limit=None, solver=None, database=None):
+    """Best (cell, tile, rotation) for the player to move, or None if stuck"""
+    if solver is None:
+        solver = Solver(max_nodes=max_nodes, time_limit=time_limit, database=database)
+    return solver.solve(state).move
@@ -0,0 +1,93 @@
+"""Counters, phase timers and optional profiling for long runs.
+
+Functions that take a ``stats`` argument fill in a Stats object when one
+is given and skip all bookkeeping when it is None. Counters are copied
+from the counts the search and caches keep anyway, and timers wrap whole
+phases or calls, so no work is added to the inner loops.
+"""
+import time
+from contextlib import contextmanager
+
+
+class Stats:
+    """Named counters and accumulated wall time per phase.
+
+    With ``profile_path`` every phase also runs under cProfile, and
+    dump_profile writes the collected profile there for pstats or
+    snakeviz.
+    """
+
+    def __init__(self, profile_path=None):
+        self.counters = {}
+        self.timings = {}
+        self.calls = {}
+        self.profile_path = profile_path
+        self._profiler = None
+        self._depth = 0
+        if profile_path is not None:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+
+    def add(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def update(self, counts, prefix=''):
+        """Add every value of a counts dict, e.g. a cache summary"""
+        for name, amount in counts.items():
+            self.add(prefix + name, amount)
+
+    def record(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body as one call of phase name; phases may nest"""
+        if self._profiler is not None and not self._depth:
+            self._profiler.enable()
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.record(name, time.perf_counter() - start)
+            self._depth -= 1
+            if self._profiler is not None and not self._depth:
+                self._profiler.disable()
+
+    def timed(self, name, function):
+        """Wrap function so that every call is timed as phase name"""
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def dump_profile(self, path=None):
+        """Write the cProfile data collected so far and return the path"""
+        if self._profiler is None:
+            raise ValueError("Stats was created without a profile_path")
+        path = path or self.profile_path
+        self._profiler.dump_stats(path)
+        return path
+
+    def as_dict(self):
+        return {
+            'counters': dict(self.counters),
+            'timings': {
+                name: {'seconds': seconds, 'calls': self.calls[name]}
+                for name, seconds in self.timings.items()
+            },
+        }
+
+    def report(self):
+        """Readable table of the timings and counters"""
+        lines = []
+        for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1]):
+            lines.append(f"{name:<24}{seconds:>10.3f}s {self.calls[name]:>10} calls")
+        for name, amount in sorted(self.counters.items()):
+            lines.append(f"{name:<24}{amount:>11}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"Stats({self.as_dict()})"
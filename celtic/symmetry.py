@@ -0,0 +1,114 @@
+"""D4 symmetries of the square board.
+
+The center tile sits in the middle of the board, so rotating or mirroring
+a position gives another position with the same game tree. Positions are
+compared by tile type and edge mask, so rotations that leave a tile's
+edges unchanged collapse to one.
+"""
+from functools import lru_cache
+
+from celtic import engine
+from celtic.engine import CELL_BITS, CELL_MASK, DEFAULT_SIZE, EDGE_TABLE, TILE_TYPES
+
+
+def _mirror_mask(mask):
+    """Swap the left and right edges of a connector mask"""
+    return (mask & 0b0101) | (mask & 0b0010) << 2 | (mask & 0b1000) >> 2
+
+
+def _transform(x, y, mask, turns, mirror, size):
+    if mirror:
+        y = size - 1 - y
+        mask = _mirror_mask(mask)
+    for _ in range(turns):
+        x, y = y, size - 1 - x
+        mask = engine.rotate_mask(mask, 90)
+    return x, y, mask
+
+
+def _canonical_code(tile, mask):
+    """Smallest cell code of tile with the given edge mask, or None"""
+    for steps in range(4):
+        if EDGE_TABLE[tile][steps] == mask:
+            return 1 + (tile << 2) + steps
+    return None
+
+
+@lru_cache(maxsize=None)
+def transforms(size=DEFAULT_SIZE):
+    """One table per symmetry that maps every tile onto a legal tile.
+
+    table[cell][code] is the code's contribution to the transformed key.
+    """
+    geometry = engine.geometry(size)
+    result = []
+    for mirror in (False, True):
+        for turns in range(4):
+            table = []
+            valid = True
+            for cell in range(geometry.cells):
+                x, y = geometry.cell_coords(cell)
+                row = [0] * (CELL_MASK + 1)
+                for tile in range(len(TILE_TYPES)):
+                    for steps in range(4):
+                        nx, ny, mask = _transform(
+                            x, y, EDGE_TABLE[tile][steps], turns, mirror, size)
+                        code = _canonical_code(tile, mask)
+                        if code is None:
+                            # A chiral tile has no mirror image among its rotations
+                            valid = False
+                            break
+                        row[1 + (tile << 2) + steps] = code << (geometry.cell_index(nx, ny) * CELL_BITS)
+                table.append(tuple(row))
+            if valid:
+                result.append(tuple(table))
+    return tuple(result)
+
+
+def transform_key(key, transform):
+    """Apply one symmetry table to a packed board key"""
+    result = 0
+    cell = 0
+    while key:
+        code = key & CELL_MASK
+        if code:
+            result |= transform[cell][code]
+        key >>= CELL_BITS
+        cell += 1
+    return result
+
+
+def canonical_key(key, size=DEFAULT_SIZE):
+    """Smallest key among all symmetric images of a position"""
+    return min(transform_key(key, transform) for transform in transforms(size))
+
+
+def canonical_form(key, size=DEFAULT_SIZE):
+    """(canonical key, transform) where transform maps key onto it"""
+    return min(
+        ((transform_key(key, transform), transform) for transform in transforms(size)),
+        key=lambda pair: pair[0],
+    )
+
+
+def _split(contribution):
+    cell = (contribution.bit_length() - 1) // CELL_BITS
+    code = contribution >> (cell * CELL_BITS)
+    return cell, (code - 1) >> 2, ((code - 1) & 3) * 90
+
+
+def transform_move(move, transform):
+    """Map a (cell, tile, rotation) move through a symmetry table"""
+    cell, tile, rotation = move
+    return _split(transform[cell][1 + (tile << 2) + rotation // 90])
+
+
+def untransform_move(move, transform):
+    """Move whose image under transform is move, using the lowest rotation"""
+    cell, tile, rotation = move
+    wanted = (1 + (tile << 2) + rotation // 90) << (cell * CELL_BITS)
+    for source, row in enumerate(transform):
+        for steps in range(4):
+            if row[1 + (tile << 2) + steps] == wanted:
+                return source, tile, steps * 90
+    raise ValueError(f"Move {move} is not the image of any move")
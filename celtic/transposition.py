@@ -0,0 +1,66 @@
+"""Bounded transposition table for game-tree search."""
+from celtic.lru import LRUCache
+from celtic.symmetry import canonical_key
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+
+
+class TranspositionTable:
+    """Map position keys to search results with a size limit.
+
+    Keys are canonicalised over the board symmetries unless ``symmetry`` is
+    False. ``eviction`` is 'lru' to drop the least recently used entry when
+    full, or 'fifo' to drop the oldest insertion.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, eviction='lru', symmetry=True):
+        if eviction not in ('lru', 'fifo'):
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.symmetry = symmetry
+        self.stores = 0
+        self._entries = LRUCache(max_entries, lru=eviction == 'lru')
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, board):
+        return canonical_key(board.key, board.size) if self.symmetry else board.key
+
+    @property
+    def hits(self):
+        return self._entries.hits
+
+    @property
+    def misses(self):
+        return self._entries.misses
+
+    @property
+    def evictions(self):
+        return self._entries.evictions
+
+    def get(self, key):
+        """Return the stored value for a key, or None on a miss"""
+        return self._entries.get(key)
+
+    def peek(self, key):
+        """Return the stored value for a key without touching the counters"""
+        return self._entries.peek(key)
+
+    def put(self, key, value):
+        if self._entries.put(key, value):
+            self.stores += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.stores = 0
+
+    def summary(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
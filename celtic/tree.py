@@ -0,0 +1,269 @@
+"""Game-tree enumeration on the bit-packed engine.
+
+Nothing here imports matplotlib or PIL; rendering code consumes the
+summaries and nodes produced by these functions.
+"""
+from collections import namedtuple
+from contextlib import nullcontext
+from itertools import repeat
+
+from celtic import engine
+from celtic.transposition import TranspositionTable
+
+# nodes counts every position below the root, leaves the positions with no
+# legal move, depth the longest move sequence and outcomes the leaves per
+# engine.OUTCOMES entry, in that order
+SubtreeSummary = namedtuple('SubtreeSummary', 'nodes leaves depth outcomes')
+
+# Summary of a position with no legal move, by its outcome
+_LEAVES = {
+    outcome: SubtreeSummary(0, 1, 0, tuple(int(name == outcome) for name in engine.OUTCOMES))
+    for outcome in engine.OUTCOMES
+}
+
+# One enumerated position. parent is the index of the parent node (None for
+# the root) and move the (cell, tile, rotation) that led here.
+TreeNode = namedtuple('TreeNode', 'index parent depth move key')
+
+# One record from iter_tree. path is the tuple of (cell, tile, rotation)
+# moves from the root, board the live position and children the number of
+# legal moves, or None when the position was not expanded.
+TreeRecord = namedtuple('TreeRecord', 'path board children')
+
+
+class TreeSummary:
+    """Counts collected while enumerating a game tree"""
+
+    def __init__(self, size):
+        self.size = size
+        self.nodes = 0
+        self.leaves = 0
+        self.depth = 0
+        self.per_depth = []
+        self.outcomes = dict.fromkeys(engine.OUTCOMES, 0)
+        self.truncated = 0
+        self.node_list = None
+        self.table = None
+        self.stats = None
+
+    def merge(self, other, offset=0, weight=1):
+        """Add the counts of a subtree summary rooted offset moves deep.
+
+        The subtree root is assumed to be counted already by this summary.
+        ``weight`` counts the subtree that many times, for positions that
+        occur more than once at the same depth.
+        """
+        for depth, count in enumerate(other.per_depth[1:], offset + 1):
+            if len(self.per_depth) <= depth:
+                self.per_depth.extend([0] * (depth + 1 - len(self.per_depth)))
+            self.per_depth[depth] += weight * count
+        self.nodes = sum(self.per_depth) - 1
+        self.depth = len(self.per_depth) - 1
+        self.leaves += weight * other.leaves
+        self.truncated += weight * other.truncated
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] += weight * count
+
+    def record_stats(self, stats):
+        """Add the walk's counters to a celtic.stats.Stats and keep it"""
+        positions = self.nodes + 1
+        stats.add('positions', positions)
+        stats.add('expanded', positions - self.leaves - self.truncated)
+        stats.add('leaves', self.leaves)
+        stats.add('truncated', self.truncated)
+        # Every position that was not cut off had its moves generated once
+        stats.add('movegen_calls', positions - self.truncated)
+        self.stats = stats
+
+    def as_dict(self):
+        result = {
+            'size': self.size,
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'depth': self.depth,
+            'per_depth': list(self.per_depth),
+            'outcomes': dict(self.outcomes),
+            'truncated': self.truncated,
+        }
+        if self.table is not None:
+            result['table'] = dict(self.table)
+        return result
+
+    def __repr__(self):
+        return f"TreeSummary({self.as_dict()})"
+
+
+def iter_tree(board=None, size=engine.DEFAULT_SIZE, max_depth=None, max_nodes=None,
+              should_expand=None):
+    """Yield a TreeRecord for every position in depth-first order.
+
+    The walk uses an explicit stack of move lists, so memory grows with the
+    depth of the tree rather than its size. ``record.board`` is the single
+    board being searched and changes after the next record is requested;
+    copy it (or keep ``board.key``) to hold on to a position.
+
+    Positions at ``max_depth``, or for which ``should_expand(board)``
+    returns False, are yielded but not expanded. The walk stops after
+    ``max_nodes`` records including the root.
+    """
+    if board is None:
+        board = engine.Board.initial(size)
+    else:
+        board = board.copy()
+
+    def expand():
+        if max_depth is not None and len(path) >= max_depth:
+            return None
+        if should_expand is not None and not should_expand(board):
+            return None
+        return board.legal_moves()
+
+    path = []
+    moves = expand()
+    yield TreeRecord((), board, None if moves is None else len(moves))
+    emitted = 1
+
+    # Each frame is [moves, next_index] for one level of the current path
+    stack = [[moves, 0]] if moves else []
+    while stack:
+        if max_nodes is not None and emitted >= max_nodes:
+            return
+        frame = stack[-1]
+        moves, index = frame
+        if index == len(moves):
+            stack.pop()
+            if path:
+                board.remove(path.pop()[0])
+            continue
+        frame[1] = index + 1
+
+        move = moves[index]
+        board.place(*move)
+        path.append(move)
+        children = expand()
+        yield TreeRecord(tuple(path), board, None if children is None else len(children))
+        emitted += 1
+
+        if children:
+            stack.append([children, 0])
+        else:
+            path.pop()
+            board.remove(move[0])
+
+
+def iter_nodes(board=None, size=engine.DEFAULT_SIZE, max_depth=None, max_nodes=None,
+               should_expand=None):
+    """Yield (TreeNode, TreeRecord) pairs for the walk of iter_tree.
+
+    Nodes are numbered in depth-first order and name the index of their
+    parent, which is tracked with a stack of the indices on the current
+    path.
+    """
+    ancestors = []
+    for index, record in enumerate(iter_tree(board, size, max_depth, max_nodes, should_expand)):
+        path = record.path
+        depth = len(path)
+        del ancestors[depth:]
+        ancestors.append(index)
+        node = TreeNode(index, ancestors[depth - 1] if depth else None, depth,
+                        path[-1] if path else None, record.board.key)
+        yield node, record
+
+
+def enumerate_tree(board=None, size=engine.DEFAULT_SIZE, max_depth=None, max_nodes=None,
+                   keep_nodes=False, stats=None, should_expand=None):
+    """Walk every move sequence from board and count what was found.
+
+    ``board`` defaults to the initial position of the given size and is
+    left unchanged. Positions at ``max_depth``, or for which
+    ``should_expand(board)`` returns False, are counted but not expanded
+    and tallied in ``truncated``; ``max_nodes`` stops the walk early. With
+    ``keep_nodes`` the positions are also returned in depth-first order as
+    ``summary.node_list``.
+
+    With a celtic.stats.Stats the walk is timed as phase 'enumerate' and
+    its counters are added; the object is also kept as ``summary.stats``.
+    """
+    with stats.phase('enumerate') if stats is not None else nullcontext():
+        summary = _enumerate(board, size, max_depth, max_nodes, keep_nodes, should_expand)
+    if stats is not None:
+        summary.record_stats(stats)
+    return summary
+
+
+def _enumerate(board, size, max_depth, max_nodes, keep_nodes, should_expand=None):
+    summary = TreeSummary(board.size if board is not None else size)
+    per_depth = summary.per_depth
+    outcomes = summary.outcomes
+    if keep_nodes:
+        nodes = []
+        walk = iter_nodes(board, size, max_depth, max_nodes, should_expand)
+    else:
+        nodes = None
+        walk = zip(repeat(None), iter_tree(board, size, max_depth, max_nodes, should_expand))
+
+    for node, (path, position, children) in walk:
+        depth = len(path)
+        if len(per_depth) <= depth:
+            per_depth.append(0)
+            summary.depth = depth
+        per_depth[depth] += 1
+
+        if children is None:
+            summary.truncated += 1
+        elif not children:
+            summary.leaves += 1
+            outcomes[position.leaf_outcome()] += 1
+
+        if nodes is not None:
+            nodes.append(node)
+
+    summary.nodes = sum(per_depth) - 1
+    summary.node_list = nodes
+    return summary
+
+
+def summarize_subtree(board, table=None, stats=None):
+    """Count the tree below board, merging transposed and symmetric positions.
+
+    ``board`` is left unchanged. Pass a TranspositionTable to share results
+    between calls or to read its hit/miss counters afterwards. A
+    celtic.stats.Stats gets phase 'summarize' and the table counters.
+    """
+    if table is None:
+        table = TranspositionTable()
+    if stats is None:
+        return _summarize(board, table)
+    before = table.summary()
+    with stats.phase('summarize'):
+        summary = _summarize(board, table)
+    after = table.summary()
+    stats.update({name: after[name] - before[name] for name in ('hits', 'misses', 'stores')},
+                 prefix='tt_')
+    return summary
+
+
+def _summarize(board, table):
+    key = table.key(board)
+    summary = table.get(key)
+    if summary is not None:
+        return summary
+
+    moves = board.legal_moves()
+    if not moves:
+        summary = _LEAVES[board.leaf_outcome()]
+    else:
+        nodes = leaves = depth = 0
+        outcomes = [0] * len(engine.OUTCOMES)
+        for cell, tile, rotation in moves:
+            board.place(cell, tile, rotation)
+            child = _summarize(board, table)
+            board.remove(cell)
+            nodes += 1 + child.nodes
+            leaves += child.leaves
+            depth = max(depth, 1 + child.depth)
+            for index, count in enumerate(child.outcomes):
+                outcomes[index] += count
+        summary = SubtreeSummary(nodes, leaves, depth, tuple(outcomes))
+    table.put(key, summary)
+    return summary
@@ -0,0 +1,206 @@
+"""Matplotlib drawings of the game tree.
+
+matplotlib is imported when a drawing is made, not with this module.
+Both drawings take an optional celtic.stats.Stats, fill in the time spent
+enumerating, composing boards and saving, and return it.
+"""
+from contextlib import nullcontext
+
+from celtic import engine, images
+from celtic.render import get_array_renderer
+from celtic.tree import enumerate_tree
+
+
+def _finish(plt, output_path, stats):
+    plt.tight_layout()
+    if output_path is None:
+        plt.show()
+        return
+    with stats.phase('savefig') if stats is not None else nullcontext():
+        _save(plt, output_path)
+
+
+def _sprite_counts(base_path):
+    cache = images.get_cache(base_path)
+    return cache.hits, cache.misses
+
+
+def _record_sprites(stats, base_path, before):
+    hits, misses = _sprite_counts(base_path)
+    stats.add('sprite_hits', hits - before[0])
+    stats.add('sprite_misses', misses - before[1])
+
+
+def _save(plt, output_path):
+    plt.savefig(output_path,
+                dpi=300,                # High resolution
+                bbox_inches='tight',    # Trim extra white space
+                facecolor='black',      # Keep black background
+                edgecolor='none',       # No edge color
+                format='png')           # Save as PNG
+    plt.close()                        # Close the figure to free memory
+
+
+def visualize_complete_game_tree(game, output_path='game_tree.png', table=None, max_depth=None,
+                                 stats=None):
+    """Render the game tree below game.
+
+    The positions to draw are collected headlessly first and then drawn
+    node by node. With a TranspositionTable, a position reached again by
+    another move order or as a rotation/mirror image is drawn but not
+    expanded again, so the walk itself skips those subtrees.
+    """
+    import matplotlib.pyplot as plt
+
+    if stats is not None:
+        before = _sprite_counts(game.base_path)
+
+    def create_and_display_tile(ax, board_img, title):
+        ax.imshow(board_img)
+        ax.set_title(title, color='white')
+        ax.axis('off')
+        return ax.get_position()
+
+    def draw_connection_line(start_center, end_center, start_y, end_y):
+        plt.plot([start_center[0], end_center[0]], [start_y, end_y], 'w-', alpha=0.3)
+
+    def should_expand(board):
+        key = table.key(board)
+        if table.get(key) is not None:
+            return False
+        table.put(key, True)
+        return True
+
+    nodes = enumerate_tree(game.state, max_depth=max_depth, keep_nodes=True, stats=stats,
+                           should_expand=should_expand if table is not None else None).node_list
+    geometry = game.state.geometry
+
+    def render(key, tile_size):
+        # The figure is drawn at savefig time, so each axes needs its own copy
+        return get_array_renderer(game.size, tile_size, game.base_path).render_key(key).copy()
+
+    if stats is not None:
+        render = stats.timed('render', render)
+
+    # Siblings share a row of the grid, so count them per parent up front
+    children = {}
+    ordinal = {}
+    for node in nodes[1:]:
+        siblings = children.setdefault(node.parent, [])
+        ordinal[node.index] = len(siblings)
+        siblings.append(node.index)
+
+    # Create figure
+    fig = plt.figure(figsize=(24, 32))
+    gs = plt.GridSpec(12, 12)  # Adjust grid size based on your needs
+
+    # Root board
+    ax_root = fig.add_subplot(gs[0, 5:7])
+    positions = {0: create_and_display_tile(
+        ax_root, render(game.state.key, 100), "Initial Board")}
+
+    for node in nodes[1:]:
+        cell, tile, rotation = node.move
+        x, y = geometry.cell_coords(cell)
+        tile_type = engine.TILE_TYPES[tile]
+        player = 'blue' if node.depth % 2 else 'red'
+
+        # Create subplot
+        cols_per_move = max(1, 12 // len(children[node.parent]))
+        col_start = ordinal[node.index] * cols_per_move
+        ax = fig.add_subplot(gs[node.depth, col_start:col_start + cols_per_move])
+
+        # Display move
+        tile_size = max(30, 100 - (node.depth * 15))
+        current_pos = create_and_display_tile(
+            ax, render(node.key, tile_size),
+            f"{player.capitalize()}: {tile_type}\n({x},{y}) {rotation}°"
+        )
+        positions[node.index] = current_pos
+
+        # Draw connection to parent
+        parent_pos = positions[node.parent]
+        current_center = (current_pos.x0 + current_pos.width / 2, current_pos.y0 + current_pos.height)
+        draw_connection_line(
+            (parent_pos.x0 + parent_pos.width / 2, parent_pos.y0 + parent_pos.height),
+            current_center,
+            parent_pos.y0,
+            current_pos.y0 + current_pos.height
+        )
+
+    _finish(plt, output_path, stats)
+    if stats is not None:
+        stats.add('boards_drawn', len(positions))
+        _record_sprites(stats, game.base_path, before)
+    return stats
+
+
+def visualize_game_tree_with_responses(game, max_blue_moves=3, max_red_responses=2,
+                                       output_path=None, stats=None):
+    """Draw the first blue moves and red's first responses to each.
+
+    The figure is shown interactively unless output_path is given.
+    """
+    import matplotlib.pyplot as plt
+
+    def render(game, tile_size):
+        return game.create_board_array(tile_size=tile_size)
+
+    if stats is not None:
+        before = _sprite_counts(game.base_path)
+        render = stats.timed('render', render)
+
+    def create_and_display_tile(ax, game, tile_type, x, y, rotation, title, tile_size):
+        game.place_tile(x, y, tile_type, rotation)
+        ax.imshow(render(game, tile_size))
+        ax.set_title(title, color='white')
+        ax.axis('off')
+        return ax.get_position()
+
+    def draw_connection_line(start_center, end_center, start_y, end_y):
+        plt.plot([start_center[0], end_center[0]], [start_y, end_y], 'w-', alpha=0.3)
+
+    # Create figure with black background
+    fig = plt.figure(figsize=(20, 16))
+    gs = plt.GridSpec(4, 6)
+
+    # Root board (top center)
+    ax_root = fig.add_subplot(gs[0, 2:4])
+    center = game.size // 2
+    root_pos = create_and_display_tile(ax_root, game, 'center', center, center, 0, "Initial Board", 100)
+    root_center = (root_pos.x0 + root_pos.width / 2, root_pos.y0)
+
+    # Generate blue moves, stopping after the first few
+    valid_blue_moves = game.legal_moves('blue', limit=max_blue_moves)
+
+    for i, (bx, by, blue_tile_type, blue_rotation) in enumerate(valid_blue_moves):
+        col_start = i * 2
+        ax_blue = fig.add_subplot(gs[1, col_start:col_start + 2])
+        blue_game = game.copy()
+        blue_pos = create_and_display_tile(
+            ax_blue, blue_game, blue_tile_type, bx, by, blue_rotation,
+            f"Blue: {blue_tile_type}\n({bx},{by}) {blue_rotation}°", 80
+        )
+        blue_center = (blue_pos.x0 + blue_pos.width / 2, blue_pos.y0 + blue_pos.height)
+        draw_connection_line(root_center, blue_center, root_center[1], blue_center[1])
+
+        # Generate red responses for this blue move
+        red_game = blue_game.copy()
+        red_game.current_player = 'red'
+
+        valid_red_moves = red_game.legal_moves(limit=max_red_responses)
+
+        for j, (rx, ry, red_tile_type, red_rotation) in enumerate(valid_red_moves):
+            ax_red = fig.add_subplot(gs[2 + j, col_start:col_start + 2])
+            response_game = blue_game.copy()
+            red_pos = create_and_display_tile(
+                ax_red, response_game, red_tile_type, rx, ry, red_rotation,
+                f"Red: {red_tile_type}\n({rx},{ry}) {red_rotation}°", 60
+            )
+            red_center = (red_pos.x0 + red_pos.width / 2, red_pos.y0 + red_pos.height)
+            draw_connection_line(blue_center, red_center, blue_pos.y0, red_center[1])
+
+    _finish(plt, output_path, stats)
+    if stats is not None:
+        _record_sprites(stats, game.base_path, before)
+    return stats